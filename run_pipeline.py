@@ -69,7 +69,9 @@ def process_file(input_file: str, config: AppConfig) -> None:
     df["datetime"] = pd.to_datetime(df["datetime"])
 
     df_with_swings = detect_swings(df, window=config.analysis.swing_window)
-    result = classify_swings_v2(df_with_swings, tolerance_pct=config.analysis.price_tolerance_pct)
+    result = classify_swings_v2(
+        df_with_swings, tolerance_pct=config.analysis.price_tolerance_pct, copy=False
+    )
 
     result = detect_climax_reversal(result, atr_multiplier=config.analysis.atr_multiplier)
     result = detect_consecutive_reversal(
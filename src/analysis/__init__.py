@@ -3,7 +3,7 @@ src.analysis 模块
 分析逻辑层，包含 K 线特征提取、指标计算、市场结构和交互式图表。
 """
 
-from .bar_features import add_bar_features, compute_bar_features
+from .bar_features import add_bar_features, compute_bar_features, compute_bar_features_batch
 from .indicators import compute_bollinger_bands, compute_ema, compute_sma
 from .interactive import (
     ChartBuilder,
@@ -35,6 +35,7 @@ __all__ = [
     "plot_structure_chart",
     # Phase 1: Bar Features
     "compute_bar_features",
+    "compute_bar_features_batch",
     "add_bar_features",
     # Phase 2: Market Structure
     "detect_swings",
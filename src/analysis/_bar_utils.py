@@ -1,56 +1,91 @@
 """Utility functions for bar feature calculations."""
 
 import numpy as np
-import pandas as pd
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
 
 
 def safe_divide_array(numerator, denominator):
     """Safely divide arrays, returning NaN for zero denominators."""
-    return np.where(denominator == 0, np.nan, numerator / denominator)
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.full(np.broadcast_shapes(numerator.shape, denominator.shape), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def rolling_mean(values, window):
+    """Calculate a trailing rolling mean; the first window - 1 values are NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n < window:
+        return np.full(n, np.nan)
+    if bn is not None:
+        return bn.move_mean(values, window, min_count=window)
+
+    out = np.full(n, np.nan)
+    window_sum = values[window - 1 :].copy()
+    for offset in range(1, window):
+        window_sum += values[window - 1 - offset : n - offset]
+    out[window - 1 :] = window_sum / window
+    return out
 
 
 def calculate_tails(high, open_price, close, low):
     """Calculate upper and lower tail sizes."""
-    upper_tail = high - np.maximum(open_price, close)
-    lower_tail = np.minimum(open_price, close) - low
+    high, open_price, close, low = (np.asarray(a) for a in (high, open_price, close, low))
+    # Each tail is built in one buffer: body edge first, then the in-place subtraction
+    upper_tail = np.empty(high.shape, dtype=np.result_type(high, open_price, close))
+    np.maximum(open_price, close, out=upper_tail)
+    np.subtract(high, upper_tail, out=upper_tail)
+    lower_tail = np.empty(low.shape, dtype=np.result_type(low, open_price, close))
+    np.minimum(open_price, close, out=lower_tail)
+    np.subtract(lower_tail, low, out=lower_tail)
     return upper_tail, lower_tail
 
 
 def calculate_blend_candle(prev_open, prev_high, prev_low, open_price, high, low, close):
     """Calculate blended (2-bar merged) candle values."""
+    high, prev_high, low, prev_low = (np.asarray(a) for a in (high, prev_high, low, prev_low))
     blend_open = prev_open
     blend_close = close
-    blend_high = np.maximum(high, prev_high)
-    blend_low = np.minimum(low, prev_low)
+    blend_high = np.empty(high.shape, dtype=np.result_type(high, prev_high))
+    np.maximum(high, prev_high, out=blend_high)
+    blend_low = np.empty(low.shape, dtype=np.result_type(low, prev_low))
+    np.minimum(low, prev_low, out=blend_low)
     return blend_open, blend_close, blend_high, blend_low
 
 
-def calculate_consecutive_streak(is_trend_bar, bar_color, df):
+def calculate_consecutive_streak(is_trend_bar, bar_color):
     """Calculate consecutive trend bar streak."""
-    trend_dir = is_trend_bar.astype(int) * bar_color
-    streak_group = (trend_dir != trend_dir.shift(1)).cumsum()
-    trend_streak_raw = df.groupby(streak_group)["close"].cumcount() + 1
+    is_trend_bar = np.asarray(is_trend_bar, dtype=bool)
+    trend_dir = is_trend_bar * np.asarray(bar_color)
+
+    run_start = np.ones(len(trend_dir), dtype=bool)
+    run_start[1:] = trend_dir[1:] != trend_dir[:-1]
+    run_start_idx = np.flatnonzero(run_start)
+    run_id = np.cumsum(run_start) - 1
+    trend_streak_raw = np.arange(len(trend_dir)) - run_start_idx[run_id] + 1
     return np.where(is_trend_bar, trend_streak_raw, 0)
 
 
 def calculate_engulfing(
     bar_color, prev_body_bottom, curr_body_bottom, prev_body_top, curr_body_top
 ):
-    """Calculate bull and bear engulfing patterns."""
-    is_bull_engulfing = (
-        (bar_color == 1)
-        & (bar_color.shift(1) == -1)
-        & (curr_body_bottom <= prev_body_bottom)
-        & (curr_body_top >= prev_body_top)
-    )
+    """Calculate bull and bear engulfing patterns as boolean arrays."""
+    color = np.asarray(bar_color)
+    prev_color = np.zeros_like(color)
+    prev_color[1:] = color[:-1]
 
-    is_bear_engulfing = (
-        (bar_color == -1)
-        & (bar_color.shift(1) == 1)
-        & (curr_body_bottom <= prev_body_bottom)
-        & (curr_body_top >= prev_body_top)
+    covers_prev_body = (np.asarray(curr_body_bottom) <= np.asarray(prev_body_bottom)) & (
+        np.asarray(curr_body_top) >= np.asarray(prev_body_top)
     )
 
+    is_bull_engulfing = (color == 1) & (prev_color == -1) & covers_prev_body
+    is_bear_engulfing = (color == -1) & (prev_color == 1) & covers_prev_body
     return is_bull_engulfing, is_bear_engulfing
 
 
@@ -72,8 +107,7 @@ def calculate_failed_breakouts(high, low, close, prev_high, prev_low, bar_color)
 
 def calculate_ema_features(close, high, low, ema):
     """Calculate EMA-related features."""
-    safe_ema = np.where(ema == 0, np.nan, ema)
-    dist_to_ema = (close - ema) / safe_ema
+    dist_to_ema = safe_divide_array(close - ema, ema)
 
     bar_pos_ema = np.where(low > ema, 1, np.where(high < ema, -1, 0))
 
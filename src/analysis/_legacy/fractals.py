@@ -7,8 +7,11 @@ analysis/fractals.py
 """
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.collections import LineCollection
 
+from .._numba_compat import njit
 from ..io.schema import COL_CLOSE, COL_DATETIME, COL_HIGH, COL_LOW, COL_OPEN
 
 plt.rcParams["font.sans-serif"] = ["SimHei", "Microsoft YaHei", "Arial"]
@@ -38,6 +41,266 @@ def _detect_columns(df: pd.DataFrame) -> tuple[str, str, str, str, str]:
     raise ValueError(f"无法识别列名格式，当前列: {df.columns.tolist()}")
 
 
+def _ensure_datetime(df: pd.DataFrame, col: str) -> None:
+    """将日期列就地转换为 datetime（已是 datetime 类型时跳过解析）"""
+    if not pd.api.types.is_datetime64_any_dtype(df[col]):
+        df[col] = pd.to_datetime(df[col])
+
+
+def _find_raw_fractals(highs, lows, skip_nan=False):
+    """
+    向量化识别原始分型（纯3根K线组合）。
+
+    顶分型：中间K线的High比左右都高
+    底分型：中间K线的Low比左右都低（与顶分型互斥，顶分型优先）
+
+    Args:
+        highs: 最高价数组
+        lows: 最低价数组
+        skip_nan: 为 True 时跳过任一价格为 NaN 的3根K线组合
+
+    Returns:
+        (top_mask, bottom_mask): 长度为 n 的布尔数组
+    """
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    n = len(highs)
+
+    top_mask = np.zeros(n, dtype=bool)
+    bottom_mask = np.zeros(n, dtype=bool)
+    if n < 3:
+        return top_mask, bottom_mask
+
+    h_prev, h_curr, h_next = highs[:-2], highs[1:-1], highs[2:]
+    l_prev, l_curr, l_next = lows[:-2], lows[1:-1], lows[2:]
+
+    top = (h_curr > h_prev) & (h_curr > h_next)
+    bottom = ~top & (l_curr < l_prev) & (l_curr < l_next)
+
+    if skip_nan:
+        valid = ~np.isnan(highs) & ~np.isnan(lows)
+        valid_window = valid[:-2] & valid[1:-1] & valid[2:]
+        top &= valid_window
+        bottom &= valid_window
+
+    top_mask[1:-1] = top
+    bottom_mask[1:-1] = bottom
+    return top_mask, bottom_mask
+
+
+def _raw_fractal_labels(top_mask, bottom_mask):
+    """将分型掩码转换为 '' / 'TOP' / 'BOTTOM' 标签列表"""
+    labels = np.full(len(top_mask), "", dtype=object)
+    labels[top_mask] = "TOP"
+    labels[bottom_mask] = "BOTTOM"
+    return labels.tolist()
+
+
+# 分型类型编码（状态机内部使用）
+_TOP = 0
+_BOTTOM = 1
+_TYPE_NAMES = ("TOP", "BOTTOM")
+
+
+@njit(cache=True)
+def _run_stroke_state_machine(idxs, types, highs, lows, min_dist, n):
+    """
+    笔过滤状态机：顶底交替 + 极值更新 + 最小间隔约束。
+
+    Args:
+        idxs: 原始分型的K线索引 (int64)
+        types: 原始分型类型编码，_TOP / _BOTTOM (int8)
+        highs: 最高价数组 (float64)
+        lows: 最低价数组 (float64)
+        min_dist: 笔端点之间的最小索引差
+        n: K线总数（候选分型的右肩K线必须 < n）
+
+    Returns:
+        (stroke_idx, stroke_type, replaced_idx, replaced_type,
+         candidate_idx, candidate_type, current_idx, current_type)
+        current_idx 为 -1 表示没有当前候选分型
+    """
+    m = len(idxs)
+    # 每个分型最多净增一个笔端点、产生两个被替换点、一条候选记录
+    stroke_idx = np.empty(m, dtype=np.int64)
+    stroke_type = np.empty(m, dtype=np.int8)
+    replaced_idx = np.empty(2 * m, dtype=np.int64)
+    replaced_type = np.empty(2 * m, dtype=np.int8)
+    candidate_idx = np.empty(m, dtype=np.int64)
+    candidate_type = np.empty(m, dtype=np.int8)
+    n_strokes = 0
+    n_replaced = 0
+    n_candidates = 0
+
+    # 状态变量，索引为 -1 表示 None；last_stroke_end 始终是最后一个笔端点
+    pending_idx = -1
+    pending_type = -1
+    last_idx = -1
+    last_type = -1
+
+    for k in range(m):
+        idx = idxs[k]
+        f_type = types[k]
+
+        if pending_idx < 0:
+            if last_idx < 0:
+                pending_idx = idx
+                pending_type = f_type
+                # 记录候选历史：分型成为 pending 时就是候选状态
+                if idx + 1 < n:
+                    candidate_idx[n_candidates] = idx
+                    candidate_type[n_candidates] = f_type
+                    n_candidates += 1
+                continue
+
+            # 同向分型：极值比较（需检查新分型与上上笔终点的距离）
+            if f_type == last_type:
+                prev_stroke_idx = stroke_idx[n_strokes - 2] if n_strokes >= 2 else -min_dist
+                more_extreme = (f_type == _TOP and highs[idx] > highs[last_idx]) or (
+                    f_type == _BOTTOM and lows[idx] < lows[last_idx]
+                )
+                # 只有当新分型与上上笔终点距离足够时才替换
+                if more_extreme and idx - prev_stroke_idx >= min_dist:
+                    replaced_idx[n_replaced] = last_idx
+                    replaced_type[n_replaced] = last_type
+                    n_replaced += 1
+                    stroke_idx[n_strokes - 1] = idx
+                    stroke_type[n_strokes - 1] = f_type
+                    last_idx = idx
+                    last_type = f_type
+                    # 补录候选历史：这个新分型也是一个有效的候选点
+                    if idx + 1 < n:
+                        candidate_idx[n_candidates] = idx
+                        candidate_type[n_candidates] = f_type
+                        n_candidates += 1
+                continue
+
+            # 反向分型：检查距离
+            if idx - last_idx < min_dist:
+                continue
+
+            pending_idx = idx
+            pending_type = f_type
+            if idx + 1 < n:
+                candidate_idx[n_candidates] = idx
+                candidate_type[n_candidates] = f_type
+                n_candidates += 1
+            continue
+
+        # 已有待确认分型
+        if f_type == pending_type:
+            # 同向分型：比较极值
+            if (f_type == _TOP and highs[idx] > highs[pending_idx]) or (
+                f_type == _BOTTOM and lows[idx] < lows[pending_idx]
+            ):
+                replaced_idx[n_replaced] = pending_idx
+                replaced_type[n_replaced] = pending_type
+                n_replaced += 1
+                pending_idx = idx
+                pending_type = f_type
+                # 记录候选历史：新的 pending 替代了旧的
+                if idx + 1 < n:
+                    candidate_idx[n_candidates] = idx
+                    candidate_type[n_candidates] = f_type
+                    n_candidates += 1
+            continue
+
+        # 反向分型：尝试确认pending
+        if last_idx >= 0 and pending_idx - last_idx < min_dist:
+            # pending太近，直接忽略 (不算作 Tx/Bx，因为从未生效过)
+            if f_type == last_type:
+                if (f_type == _TOP and highs[idx] > highs[last_idx]) or (
+                    f_type == _BOTTOM and lows[idx] < lows[last_idx]
+                ):
+                    replaced_idx[n_replaced] = last_idx
+                    replaced_type[n_replaced] = last_type
+                    n_replaced += 1
+                    stroke_idx[n_strokes - 1] = idx
+                    stroke_type[n_strokes - 1] = f_type
+                    last_idx = idx
+                    last_type = f_type
+                pending_idx = -1
+                pending_type = -1
+            else:
+                pending_idx = idx
+                pending_type = f_type
+            continue
+
+        # 距离足够，准备确认 pending
+        # 【关键验证】检查从 last_stroke_end 到 pending 的区间内是否存在更极端的价格
+        # 如果存在，说明 pending 不是真正的极值点，这一笔无效
+        # （逐个比较，与内置 max/min 对 NaN 的处理一致）
+        is_valid_stroke = True
+        if last_idx >= 0:
+            if pending_type == _TOP:
+                extreme = highs[last_idx]
+                for j in range(last_idx + 1, pending_idx + 1):
+                    if highs[j] > extreme:
+                        extreme = highs[j]
+                if extreme > highs[pending_idx]:
+                    is_valid_stroke = False
+            else:
+                extreme = lows[last_idx]
+                for j in range(last_idx + 1, pending_idx + 1):
+                    if lows[j] < extreme:
+                        extreme = lows[j]
+                if extreme < lows[pending_idx]:
+                    is_valid_stroke = False
+
+        if is_valid_stroke:
+            stroke_idx[n_strokes] = pending_idx
+            stroke_type[n_strokes] = pending_type
+            n_strokes += 1
+            last_idx = pending_idx
+            last_type = pending_type
+            pending_idx = idx
+            pending_type = f_type
+            # 记录候选历史：新的 pending 成为候选
+            if idx + 1 < n:
+                candidate_idx[n_candidates] = idx
+                candidate_type[n_candidates] = f_type
+                n_candidates += 1
+        else:
+            # 笔无效：pending 不是真正的极值点
+            # 【方案3】只回溯一层：取消 last_stroke_end，然后直接确认当前分型
+            replaced_idx[n_replaced] = pending_idx
+            replaced_type[n_replaced] = pending_type
+            n_replaced += 1
+            if n_strokes > 0:
+                n_strokes -= 1
+                replaced_idx[n_replaced] = stroke_idx[n_strokes]
+                replaced_type[n_replaced] = stroke_type[n_strokes]
+                n_replaced += 1
+
+            # 回溯后，直接将当前反向分型确认为新的笔端点，不再验证
+            # 这样可以避免级联取消
+            stroke_idx[n_strokes] = idx
+            stroke_type[n_strokes] = f_type
+            n_strokes += 1
+            last_idx = idx
+            last_type = f_type
+            pending_idx = -1
+            pending_type = -1
+
+    # 处理最后一个pending：距离足够（或没有 last_stroke_end）时为当前候选分型
+    current_idx = -1
+    current_type = -1
+    if pending_idx >= 0 and (last_idx < 0 or pending_idx - last_idx >= min_dist):
+        current_idx = pending_idx
+        current_type = pending_type
+
+    return (
+        stroke_idx[:n_strokes],
+        stroke_type[:n_strokes],
+        replaced_idx[:n_replaced],
+        replaced_type[:n_replaced],
+        candidate_idx[:n_candidates],
+        candidate_type[:n_candidates],
+        current_idx,
+        current_type,
+    )
+
+
 def process_fractals(input_path, output_path, save_plot_path=None):
     """
     简化版分型识别（Al Brooks 风格）。
@@ -61,8 +324,8 @@ def process_fractals(input_path, output_path, save_plot_path=None):
     col_dt, col_open, col_high, col_low, col_close = _detect_columns(df)
     print(f"检测到列名格式: high={col_high}, low={col_low}")
 
-    highs = df[col_high].values
-    lows = df[col_low].values
+    highs = df[col_high].to_numpy(dtype=np.float64)
+    lows = df[col_low].to_numpy(dtype=np.float64)
     opens = df[col_open].values
     closes = df[col_close].values
     n = len(df)
@@ -77,29 +340,11 @@ def process_fractals(input_path, output_path, save_plot_path=None):
     # 底分型：中间K线的Low比左右都低
     # 注意：跳过包含 NaN 值的 K 线
     # ============================================================
-    raw_fractals = [""] * n  # '', 'TOP', 'BOTTOM'
-
-    import math
-
-    for i in range(1, n - 1):
-        h_prev, h_curr, h_next = highs[i - 1], highs[i], highs[i + 1]
-        l_prev, l_curr, l_next = lows[i - 1], lows[i], lows[i + 1]
-
-        # 跳过包含 NaN 的 K 线组合
-        if any(
-            math.isnan(x) if isinstance(x, float) else False
-            for x in [h_prev, h_curr, h_next, l_prev, l_curr, l_next]
-        ):
-            continue
+    # 合并处理后，顶分型也意味着 Low 较高，底分型也意味着 High 较低
+    top_mask, bottom_mask = _find_raw_fractals(highs, lows, skip_nan=True)
+    raw_fractals = _raw_fractal_labels(top_mask, bottom_mask)  # '', 'TOP', 'BOTTOM'
 
-        # 顶分型：中间K线的High比左右都高 (合并处理后，这也意味着 Low 也较高)
-        if h_curr > h_prev and h_curr > h_next:
-            raw_fractals[i] = "TOP"
-        # 底分型：中间K线的Low比左右都低 (合并处理后，这也意味着 High 也较低)
-        elif l_curr < l_prev and l_curr < l_next:
-            raw_fractals[i] = "BOTTOM"
-
-    raw_count = sum(1 for x in raw_fractals if x)
+    raw_count = int(top_mask.sum() + bottom_mask.sum())
     print(f"原始分型数量: {raw_count}")
 
     # ============================================================
@@ -133,11 +378,71 @@ def process_fractals(input_path, output_path, save_plot_path=None):
     print(f"结果已保存至: {output_path}")
 
 
-def process_strokes(input_path, output_path, save_plot_path=None):
+def _detect_fractals(highs, lows):
+    """
+    识别原始分型，并编码为笔过滤状态机的输入。
+
+    与 min_dist 无关，可在多次 _filter_strokes 调用之间复用。
+
+    Returns:
+        (top_mask, bottom_mask, fractal_idxs, fractal_types):
+        fractal_idxs 为分型K线索引 (int64)，fractal_types 为 _TOP/_BOTTOM 编码 (int8)
+    """
+    top_mask, bottom_mask = _find_raw_fractals(highs, lows)
+    fractal_idxs = np.flatnonzero(top_mask | bottom_mask).astype(np.int64)
+    fractal_types = np.where(top_mask[fractal_idxs], _TOP, _BOTTOM).astype(np.int8)
+    return top_mask, bottom_mask, fractal_idxs, fractal_types
+
+
+def _filter_strokes(fractal_idxs, fractal_types, highs, lows, min_dist=MIN_DIST):
+    """
+    对 _detect_fractals 的结果运行笔过滤状态机，并还原为 (index, 'TOP'|'BOTTOM') 形式。
+
+    Returns:
+        (strokes, replaced_candidates, candidate_history, current_candidate)
+    """
+    n = len(highs)
+    (
+        stroke_idx,
+        stroke_type,
+        replaced_idx,
+        replaced_type,
+        candidate_idx,
+        candidate_type,
+        current_idx,
+        current_type,
+    ) = _run_stroke_state_machine(
+        fractal_idxs,
+        fractal_types,
+        np.asarray(highs, dtype=np.float64),
+        np.asarray(lows, dtype=np.float64),
+        min_dist,
+        n,
+    )
+
+    # 有效笔的端点列表: [(index, type), ...]
+    strokes = [(i, _TYPE_NAMES[t]) for i, t in zip(stroke_idx.tolist(), stroke_type.tolist())]
+    # 被替换的候选列表
+    replaced_candidates = [
+        (i, _TYPE_NAMES[t]) for i, t in zip(replaced_idx.tolist(), replaced_type.tolist())
+    ]
+    # 候选分型记录: [(fractal_idx, fractal_type, candidate_bar_idx), ...]
+    # candidate_bar_idx 是该分型成为候选时的K线索引（= fractal_idx + 1，右肩K线）
+    candidate_history = [
+        (i, _TYPE_NAMES[t], i + 1) for i, t in zip(candidate_idx.tolist(), candidate_type.tolist())
+    ]
+    # 当前候选分型 (pending 从未被确认，且不在 replaced_candidates 中)
+    current_candidate = (int(current_idx), _TYPE_NAMES[current_type]) if current_idx >= 0 else None
+    return strokes, replaced_candidates, candidate_history, current_candidate
+
+
+def process_strokes(input_path, output_path, save_plot_path=None, min_dist=MIN_DIST):
     """
     从合并后的K线数据中：
     1. 识别原始分型（顶/底）
     2. 应用笔的规则过滤（顶底交替 + 极值更新 + 间隔约束）
+
+    min_dist 为笔端点之间的最小索引差（默认 MIN_DIST）。
     """
     print(f"读取合并后的K线数据: {input_path}")
 
@@ -151,8 +456,9 @@ def process_strokes(input_path, output_path, save_plot_path=None):
     col_dt, col_open, col_high, col_low, col_close = _detect_columns(df)
     print(f"检测到列名格式: high={col_high}, low={col_low}")
 
-    highs = df[col_high].tolist()
-    lows = df[col_low].tolist()
+    # 一次转换为 float64，分型识别与笔过滤状态机直接复用同一缓冲区
+    highs = df[col_high].to_numpy(dtype=np.float64)
+    lows = df[col_low].to_numpy(dtype=np.float64)
     n = len(df)
 
     if n < 3:
@@ -163,20 +469,10 @@ def process_strokes(input_path, output_path, save_plot_path=None):
     # 第一步：识别原始分型（纯3根K线组合）
     # 注：分型识别只看相邻3根K线，距离约束在笔过滤阶段处理
     # ============================================================
-    raw_fractals = [""] * n  # '', 'TOP', 'BOTTOM'
+    top_mask, bottom_mask, fractal_idxs, fractal_types = _detect_fractals(highs, lows)
+    raw_fractals = _raw_fractal_labels(top_mask, bottom_mask)  # '', 'TOP', 'BOTTOM'
 
-    for i in range(1, n - 1):
-        h_prev, h_curr, h_next = highs[i - 1], highs[i], highs[i + 1]
-        l_prev, l_curr, l_next = lows[i - 1], lows[i], lows[i + 1]
-
-        # 顶分型：中间K线的High比左右都高
-        if h_curr > h_prev and h_curr > h_next:
-            raw_fractals[i] = "TOP"
-        # 底分型：中间K线的Low比左右都低
-        elif l_curr < l_prev and l_curr < l_next:
-            raw_fractals[i] = "BOTTOM"
-
-    raw_count = sum(1 for x in raw_fractals if x)
+    raw_count = int(top_mask.sum() + bottom_mask.sum())
     print(f"原始分型数量: {raw_count}")
 
     # ============================================================
@@ -184,187 +480,13 @@ def process_strokes(input_path, output_path, save_plot_path=None):
     # 规则：顶底交替 + 极值更新 + 最小间隔约束
     # ============================================================
 
-    # 收集所有原始分型的 (索引, 类型)
-    fractal_points = [(i, raw_fractals[i]) for i in range(n) if raw_fractals[i]]
-
-    if not fractal_points:
+    if len(fractal_idxs) == 0:
         print("未找到任何分型")
         return
 
-    # 有效笔的端点列表: [(index, type), ...]
-    strokes = []
-    # 每个笔端点的确认信息: {fractal_idx: confirm_idx}
-    # confirm_idx 是该分型被确认时的K线索引（即出现反向分型的那根K线）
-    stroke_confirm_info = {}
-
-    # 状态变量
-    pending = None
-    last_stroke_end = None
-    # 被替换的候选列表
-    replaced_candidates = []
-    # 候选分型记录: [(fractal_idx, fractal_type, candidate_bar_idx), ...]
-    # candidate_bar_idx 是该分型成为候选时的K线索引（= fractal_idx + 1，右肩K线）
-    candidate_history = []
-    # 当前候选分型 (pending 从未被确认，且不在 replaced_candidates 中)
-    current_candidate = None
-
-    for idx, f_type in fractal_points:
-
-        if pending is None:
-            if last_stroke_end is None:
-                pending = (idx, f_type)
-                # 记录候选历史：分型成为 pending 时就是候选状态
-                candidate_bar = idx + 1
-                if candidate_bar < n:
-                    candidate_history.append((idx, f_type, candidate_bar))
-                continue
-
-            dist = idx - last_stroke_end[0]
-
-            # 同向分型：极值比较（需检查新分型与上上笔终点的距离）
-            if f_type == last_stroke_end[1]:
-                # 计算与上上笔终点的距离（如果存在的话）
-                prev_stroke_idx = strokes[-2][0] if len(strokes) >= 2 else -MIN_DIST
-                dist_to_prev = idx - prev_stroke_idx
-
-                if f_type == "TOP" and highs[idx] > highs[last_stroke_end[0]]:
-                    # 只有当新分型与上上笔终点距离足够时才替换
-                    if dist_to_prev >= MIN_DIST:
-                        old = strokes.pop()
-                        replaced_candidates.append(old)
-                        strokes.append((idx, f_type))
-                        last_stroke_end = (idx, f_type)
-                        # 补录候选历史：这个新分型也是一个有效的候选点
-                        candidate_bar = idx + 1
-                        if candidate_bar < n:
-                            candidate_history.append((idx, f_type, candidate_bar))
-                elif f_type == "BOTTOM" and lows[idx] < lows[last_stroke_end[0]]:
-                    if dist_to_prev >= MIN_DIST:
-                        old = strokes.pop()
-                        replaced_candidates.append(old)
-                        strokes.append((idx, f_type))
-                        last_stroke_end = (idx, f_type)
-                        # 补录候选历史
-                        candidate_bar = idx + 1
-                        if candidate_bar < n:
-                            candidate_history.append((idx, f_type, candidate_bar))
-                continue
-
-            # 反向分型：检查距离
-            if dist < MIN_DIST:
-                continue
-
-            pending = (idx, f_type)
-            # 记录候选历史
-            candidate_bar = idx + 1
-            if candidate_bar < n:
-                candidate_history.append((idx, f_type, candidate_bar))
-            continue
-
-        # 已有待确认分型
-        pending_idx, pending_type = pending
-
-        if f_type == pending_type:
-            # 同向分型：比较极值
-            if f_type == "TOP":
-                if highs[idx] > highs[pending_idx]:
-                    replaced_candidates.append(pending)
-                    pending = (idx, f_type)
-                    # 记录候选历史：新的 pending 替代了旧的
-                    candidate_bar = idx + 1
-                    if candidate_bar < n:
-                        candidate_history.append((idx, f_type, candidate_bar))
-            elif f_type == "BOTTOM":
-                if lows[idx] < lows[pending_idx]:
-                    replaced_candidates.append(pending)
-                    pending = (idx, f_type)
-                    # 记录候选历史
-                    candidate_bar = idx + 1
-                    if candidate_bar < n:
-                        candidate_history.append((idx, f_type, candidate_bar))
-        else:
-            # 反向分型：尝试确认pending
-            if last_stroke_end is not None:
-                dist = pending_idx - last_stroke_end[0]
-                if dist < MIN_DIST:
-                    # pending太近，直接忽略 (不算作 Tx/Bx，因为从未生效过)
-                    # replaced_candidates.append(pending)  <-- 删除此行
-
-                    if f_type == last_stroke_end[1]:
-                        if f_type == "TOP" and highs[idx] > highs[last_stroke_end[0]]:
-                            old = strokes.pop()
-                            replaced_candidates.append(old)
-                            strokes.append((idx, f_type))
-                            last_stroke_end = (idx, f_type)
-                        elif f_type == "BOTTOM" and lows[idx] < lows[last_stroke_end[0]]:
-                            old = strokes.pop()
-                            replaced_candidates.append(old)
-                            strokes.append((idx, f_type))
-                            last_stroke_end = (idx, f_type)
-                        pending = None
-                    else:
-                        pending = (idx, f_type)
-                    continue
-
-            # 距离足够，准备确认 pending
-            # 【关键验证】检查从 last_stroke_end 到 pending 的区间内是否存在更极端的价格
-            # 如果存在，说明 pending 不是真正的极值点，这一笔无效
-            is_valid_stroke = True
-            if last_stroke_end is not None:
-                start_idx = last_stroke_end[0]
-                end_idx = pending_idx
-
-                if pending_type == "TOP":
-                    # 检查区间内是否有更高的 high
-                    max_high_in_range = max(highs[start_idx : end_idx + 1])
-                    if max_high_in_range > highs[pending_idx]:
-                        is_valid_stroke = False
-                elif pending_type == "BOTTOM":
-                    # 检查区间内是否有更低的 low
-                    min_low_in_range = min(lows[start_idx : end_idx + 1])
-                    if min_low_in_range < lows[pending_idx]:
-                        is_valid_stroke = False
-
-            if is_valid_stroke:
-                # 记录确认信息
-                stroke_confirm_info[pending_idx] = idx
-
-                strokes.append(pending)
-                last_stroke_end = pending
-                pending = (idx, f_type)
-                # 记录候选历史：新的 pending 成为候选
-                candidate_bar = idx + 1
-                if candidate_bar < n:
-                    candidate_history.append((idx, f_type, candidate_bar))
-            else:
-                # 笔无效：pending 不是真正的极值点
-                # 【方案3】只回溯一层：取消 last_stroke_end，然后直接确认当前分型
-                replaced_candidates.append(pending)
-                if strokes:
-                    old_stroke = strokes.pop()
-                    replaced_candidates.append(old_stroke)
-
-                # 回溯后，直接将当前反向分型确认为新的笔端点，不再验证
-                # 这样可以避免级联取消
-                strokes.append((idx, f_type))
-                last_stroke_end = (idx, f_type)
-                pending = None
-
-    # 处理最后一个pending
-    # pending 状态的分型是"候选分型"，尚未被反向分型确认
-    if pending is not None:
-        if last_stroke_end is not None:
-            dist = pending[0] - last_stroke_end[0]
-            if dist >= MIN_DIST:
-                # 距离足够但尚未被反向分型确认
-                # 这是一个有效的候选分型
-                current_candidate = pending
-            else:
-                # 距离不够，不是有效候选
-                pass
-        else:
-            # 没有 last_stroke_end，pending 作为第一个候选
-            current_candidate = pending
+    strokes, replaced_candidates, candidate_history, current_candidate = _filter_strokes(
+        fractal_idxs, fractal_types, highs, lows, min_dist
+    )
 
     # ============================================================
     # 第三步：生成输出
@@ -414,7 +536,7 @@ def process_strokes(input_path, output_path, save_plot_path=None):
     df.to_csv(output_path, index=False, encoding="utf-8")
 
     # 统计
-    print(f"过滤完成。规则: 最小间隔 {MIN_DIST}")
+    print(f"过滤完成。规则: 最小间隔 {min_dist}")
     print(f"有效笔端点: {len(strokes)}, 被替换: {len(replaced_candidates)}, 原始分型: {raw_count}")
     print(f"结果已保存至: {output_path}")
 
@@ -538,8 +660,6 @@ def plot_strokes(
     """绘制带笔端点标注和S/R线的K线图"""
     print("\n开始绘制...")
 
-    df[col_dt] = pd.to_datetime(df[col_dt])
-
     # 显示最后100根K线
     num_bars = 100
     if len(df) > num_bars:
@@ -549,6 +669,9 @@ def plot_strokes(
         plot_df = df.copy().reset_index(drop=True)
         offset = 0
 
+    # 只转换绘图切片的日期列，不修改调用方的 df
+    _ensure_datetime(plot_df, col_dt)
+
     # 调整索引到 plot_df 的范围
     plot_strokes_only = [(idx - offset, t[0]) for idx, t in strokes]  # 仅用于连线
     # 处理2元组和3元组格式的标记
@@ -560,101 +683,122 @@ def plot_strokes(
             idx, t = marker  # 2元组: (idx, type)
         plot_all_markers.append((idx - offset, t))
 
+    # 价格一次性转为 NumPy 数组，后续按索引直接取值
     dates = plot_df[col_dt]
-    opens = plot_df[col_open]
-    closes = plot_df[col_close]
-    highs = plot_df[col_high]
-    lows = plot_df[col_low]
+    open_arr = plot_df[col_open].to_numpy(dtype=np.float64)
+    close_arr = plot_df[col_close].to_numpy(dtype=np.float64)
+    high_arr = plot_df[col_high].to_numpy(dtype=np.float64)
+    low_arr = plot_df[col_low].to_numpy(dtype=np.float64)
 
     # 根据数据量调整图表宽度
     fig_width = max(14, len(plot_df) * 0.12)
-    fig, ax = plt.subplots(figsize=(fig_width, 8))
+    fig, ax = plt.subplots(figsize=(fig_width, 8), layout="tight")
 
     width = 0.6
-    width2 = 0.05
 
-    up = closes >= opens
-    down = closes < opens
-    col_up, col_down = "red", "green"
+    xs = np.arange(len(plot_df), dtype=np.float64)
+    colors = np.where(close_arr >= open_arr, "red", "green")
 
-    # 绘制K线
-    ax.bar(plot_df.index[up], highs[up] - lows[up], width2, bottom=lows[up], color=col_up)
-    ax.bar(plot_df.index[down], highs[down] - lows[down], width2, bottom=lows[down], color=col_down)
-    ax.bar(plot_df.index[up], (closes[up] - opens[up]).abs(), width, bottom=opens[up], color=col_up)
+    # 绘制K线：影线合并为一个 LineCollection，实体一次 bar 调用
+    wicks = np.stack([np.column_stack([xs, low_arr]), np.column_stack([xs, high_arr])], axis=1)
+    ax.add_collection(LineCollection(wicks, colors=colors, linewidths=0.6))
     ax.bar(
-        plot_df.index[down],
-        (closes[down] - opens[down]).abs(),
+        xs,
+        np.abs(close_arr - open_arr),
         width,
-        bottom=closes[down],
-        color=col_down,
+        bottom=np.minimum(open_arr, close_arr),
+        color=colors,
     )
 
     # 绘制所有分型标记
+    # 确认的 T/B 标注价格，逐个 annotate；被替换的 Tx/Bx 文字固定，按类型各一次 scatter
+    replaced_tops, replaced_bottoms = [], []
     for plot_idx, f_type in plot_all_markers:
         if plot_idx < 0 or plot_idx >= len(plot_df):
             continue
 
-        is_cancelled = "x" in f_type
-        base_type = f_type.replace("x", "")
-
-        if base_type == "T":
-            color = "gray" if is_cancelled else "black"
-            price = highs.iloc[plot_idx]
-            label = "Tx" if is_cancelled else f"T {price:.2f}"
+        if f_type == "Tx":
+            replaced_tops.append(plot_idx)
+        elif f_type == "Bx":
+            replaced_bottoms.append(plot_idx)
+        elif f_type == "T":
+            price = high_arr[plot_idx]
             ax.annotate(
-                label,
+                f"T {price:.2f}",
                 xy=(plot_idx, price),
                 xytext=(plot_idx + 0.3, price * 1.001),
                 ha="left",
                 fontsize=8,
                 fontweight="bold",
-                color=color,
+                color="black",
             )
-        elif base_type == "B":
-            color = "gray" if is_cancelled else "blue"
-            price = lows.iloc[plot_idx]
-            label = "Bx" if is_cancelled else f"B {price:.2f}"
+        elif f_type == "B":
+            price = low_arr[plot_idx]
             ax.annotate(
-                label,
+                f"B {price:.2f}",
                 xy=(plot_idx, price),
                 xytext=(plot_idx + 0.3, price * 0.998),
                 ha="left",
                 fontsize=8,
                 fontweight="bold",
-                color=color,
+                color="blue",
             )
 
+    if replaced_tops:
+        marker_xs = np.asarray(replaced_tops)
+        ax.scatter(
+            marker_xs + 0.7,
+            high_arr[marker_xs] * 1.002,
+            marker=r"$\mathbf{Tx}$",
+            s=110,
+            c="gray",
+            linewidths=0,
+        )
+    if replaced_bottoms:
+        marker_xs = np.asarray(replaced_bottoms)
+        ax.scatter(
+            marker_xs + 0.7,
+            low_arr[marker_xs] * 0.9975,
+            marker=r"$\mathbf{Bx}$",
+            s=110,
+            c="gray",
+            linewidths=0,
+        )
+
     # 绘制 B->T 连线 (上涨笔)
     # stroke list example: [(idx, 'T'), (idx, 'B')]
     # plot_strokes_only 已经是相对索引 (idx-offset, type)
 
     sorted_strokes = sorted(plot_strokes_only, key=lambda x: x[0])
 
-    for i in range(len(sorted_strokes) - 1):
-        curr_idx, curr_type = sorted_strokes[i]
-        next_idx, next_type = sorted_strokes[i + 1]
-
-        # 过滤: 必须在绘图范围内 (虽然 plot_strokes_only 可能会有负索引，但在 loop 前应该已经处理?
-        # 这里 plot_strokes_only 生成时只是减去了 offset, 没有过滤范围，所以必须检查)
-        if curr_idx < 0 or curr_idx >= len(plot_df) or next_idx < 0 or next_idx >= len(plot_df):
-            continue
-
-        # 仅连接 B -> T
-        if curr_type == "B" and next_type == "T":
-            # B在low, T在high
-            y1 = lows.iloc[curr_idx]
-            y2 = highs.iloc[next_idx]
-
-            ax.plot([curr_idx, next_idx], [y1, y2], color="purple", linewidth=1.5, alpha=0.8)
+    if len(sorted_strokes) >= 2:
+        stroke_pos = np.array([idx for idx, _ in sorted_strokes])
+        stroke_kind = np.array([t for _, t in sorted_strokes])
+        curr_pos, next_pos = stroke_pos[:-1], stroke_pos[1:]
+
+        # 过滤: 两端都必须在绘图范围内 (plot_strokes_only 只减去了 offset，可能有负索引)
+        in_range = (curr_pos >= 0) & (next_pos >= 0)
+        in_range &= (curr_pos < len(plot_df)) & (next_pos < len(plot_df))
+        # 仅连接 B -> T (B在low, T在high)
+        is_up = in_range & (stroke_kind[:-1] == "B") & (stroke_kind[1:] == "T")
+
+        if is_up.any():
+            starts = np.column_stack([curr_pos[is_up], low_arr[curr_pos[is_up]]])
+            ends = np.column_stack([next_pos[is_up], high_arr[next_pos[is_up]]])
+            ax.add_collection(
+                LineCollection(
+                    np.stack([starts, ends], axis=1), colors="purple", linewidths=1.5, alpha=0.8
+                )
+            )
 
     # 绘制所有分型标记 (T/B Annotations)
 
     step = 5
     ax.set_xticks(range(0, len(plot_df), step))
-    ax.set_xticklabels([d.strftime("%Y-%m-%d") for d in dates[::step]], rotation=45, fontsize=8)
+    ax.set_xticklabels(dates.iloc[::step].dt.strftime("%Y-%m-%d"), rotation=45, fontsize=8)
 
     # 给Y轴留出边距，确保最高/最低点和标签不贴边
-    y_min, y_max = lows.min(), highs.max()
+    y_min, y_max = np.nanmin(low_arr), np.nanmax(high_arr)
     y_margin = (y_max - y_min) * 0.05  # 5% 边距
     ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
@@ -663,12 +807,12 @@ def plot_strokes(
 
     if save_path:
         # 保存 PNG（高DPI）
-        plt.savefig(save_path, dpi=200, bbox_inches="tight")
+        plt.savefig(save_path, dpi=200)
         print(f"图表已保存至: {save_path}")
 
         # 同时保存 SVG 矢量图
         svg_path = save_path.replace(".png", ".svg")
-        plt.savefig(svg_path, format="svg", bbox_inches="tight")
+        plt.savefig(svg_path, format="svg")
         print(f"矢量图已保存至: {svg_path}")
         plt.close()
     else:
@@ -334,10 +334,11 @@ def _validate_merged_data(df, col_high, col_low, col_open, col_close):
 def plot_merged_kline(df, col_dt, col_open, col_high, col_low, col_close, save_path=None):
     """绘制合并后的 K 线图"""
     print("\n开始绘制合并后的 K 线图...")
-    df[col_dt] = pd.to_datetime(df[col_dt])
-
     num_bars = 60
     plot_df = df.tail(num_bars).copy().reset_index(drop=True)
+    # 只转换绘图切片的日期列，不修改调用方的 df
+    if not pd.api.types.is_datetime64_any_dtype(plot_df[col_dt]):
+        plot_df[col_dt] = pd.to_datetime(plot_df[col_dt])
 
     dates = plot_df[col_dt]
     opens = plot_df[col_open]
@@ -346,7 +347,7 @@ def plot_merged_kline(df, col_dt, col_open, col_high, col_low, col_close, save_p
     lows = plot_df[col_low]
     status_list = plot_df["kline_status"]
 
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, ax = plt.subplots(figsize=(14, 8), layout="tight")
 
     width = 0.6
     width2 = 0.05
@@ -368,22 +369,23 @@ def plot_merged_kline(df, col_dt, col_open, col_high, col_low, col_close, save_p
 
     step = 5
     ax.set_xticks(range(0, len(plot_df), step))
-    ax.set_xticklabels([d.strftime("%Y-%m-%d") for d in dates[::step]], rotation=45, fontsize=8)
-
-    for i in range(len(plot_df)):
-        status = str(status_list.iloc[i])
-        if "(M)" in status:
-            ax.text(
-                i,
-                highs.iloc[i] * 1.0005,
-                "M",
-                ha="center",
-                va="bottom",
-                rotation=0,
-                fontsize=8,
-                color="purple",
-                fontweight="bold",
-            )
+    ax.set_xticklabels(dates.iloc[::step].dt.strftime("%Y-%m-%d"), rotation=45, fontsize=8)
+
+    # 合并K线的位置与最高价一次取出，避免逐行 iloc
+    merged_pos = np.flatnonzero(status_list.astype(str).str.contains("(M)", regex=False))
+    high_arr = highs.to_numpy(dtype=np.float64)
+    for i in merged_pos.tolist():
+        ax.text(
+            i,
+            high_arr[i] * 1.0005,
+            "M",
+            ha="center",
+            va="bottom",
+            rotation=0,
+            fontsize=8,
+            color="purple",
+            fontweight="bold",
+        )
 
     ax.set_title("Merged K-line Visualization (Recursive)", fontsize=14)
     ax.set_ylabel("Price")
@@ -397,7 +399,7 @@ def plot_merged_kline(df, col_dt, col_open, col_high, col_low, col_close, save_p
     )
 
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches="tight")
+        plt.savefig(save_path, dpi=150)
         print(f"图表已保存至: {save_path}")
         plt.close()
     else:
@@ -0,0 +1,32 @@
+"""Optional Numba support for sequential kernels.
+
+``njit`` compiles the decorated function with Numba when it is installed and
+otherwise returns it unchanged, so kernels written against NumPy arrays and
+scalars still run as plain Python.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit as _numba_njit
+
+    HAS_NUMBA = True
+except ImportError:
+    _numba_njit = None
+    HAS_NUMBA = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Any:
+    """Apply ``numba.njit`` when available; usable bare or with options."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        return func
+
+    return decorator
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Literal, Optional
+import math
+from typing import Literal, Optional, Sequence, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -11,29 +12,79 @@ import pandas as pd
 DEFAULT_SWING_WINDOW = 5
 PRICE_TOLERANCE_PCT = 0.001
 
+EVENT_HIGH = 0
+EVENT_LOW = 1
+
+SWING_TYPES = ("HH", "LH", "HL", "LL", "DT", "DB")
+SWING_TYPE_CODES = {label: code for code, label in enumerate(SWING_TYPES)}
+_HH, _LH, _HL, _LL, _DT, _DB = (SWING_TYPE_CODES[label] for label in SWING_TYPES)
+# (higher, lower, double, first swing) codes for each swing kind
+_SWING_HIGH_CODES = (_HH, _LH, _DT, _HH)
+_SWING_LOW_CODES = (_HL, _LL, _DB, _LL)
+
 
 def safe_divide(
     numerator: npt.NDArray[np.float64] | pd.Series,
     denominator: npt.NDArray[np.float64] | pd.Series,
     fill_value: float = np.nan,
 ) -> npt.NDArray[np.float64] | pd.Series:
-    """Safely divide two arrays/series, handling zeros."""
-    safe_denom = np.where(denominator == 0, np.nan, denominator)
-    return numerator / safe_denom
+    """Safely divide two arrays/series, filling ``fill_value`` where the denominator is zero.
+
+    Returns a Series when either operand is one, indexed like the numerator if
+    it is a Series and like the denominator otherwise.
+    """
+    num = np.asarray(numerator, dtype=np.float64)
+    denom = np.asarray(denominator, dtype=np.float64)
+    out = np.full(np.broadcast_shapes(num.shape, denom.shape), fill_value)
+    np.divide(num, denom, out=out, where=denom != 0)
+    for operand in (numerator, denominator):
+        if isinstance(operand, pd.Series):
+            return pd.Series(out, index=operand.index, name=operand.name)
+    return out
 
 
 def detect_duplicates(arr: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
     """Remove consecutive duplicates, keeping only the first occurrence."""
-    prev_arr = np.roll(arr, 1)
-    prev_arr[0] = False
-    return arr & ~prev_arr
+    # No copy for boolean masks; other truthy inputs are converted once
+    arr = np.asarray(arr, dtype=np.bool_)
+    out = np.empty_like(arr)
+    out[:1] = arr[:1]
+    # For booleans a & ~b is a > b: one pass, no inverted temporary
+    np.greater(arr[1:], arr[:-1], out=out[1:])
+    return out
+
+
+def forward_fill(arr: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Forward-fill NaN values in a 1-D float array (leading NaNs are kept)."""
+    arr = np.asarray(arr, dtype=np.float64)
+    idx = np.where(np.isnan(arr), 0, np.arange(len(arr)))
+    np.maximum.accumulate(idx, out=idx)
+    return arr[idx]
+
+
+def centered_extremum(
+    arr: npt.NDArray[np.floating], half_window: int, kind: Literal["max", "min"]
+) -> npt.NDArray[np.floating]:
+    """Centered rolling max/min over ``2 * half_window + 1`` bars, skipping NaN.
+
+    Matches ``rolling(2 * half_window + 1, center=True, min_periods=1)`` and keeps
+    the input dtype.
+    """
+    n = len(arr)
+    ufunc = np.fmax if kind == "max" else np.fmin
+    padded = np.full(n + 2 * half_window, np.nan, dtype=arr.dtype)
+    padded[half_window : half_window + n] = arr
+    out = padded[:n].copy()
+    for offset in range(1, 2 * half_window + 1):
+        ufunc(out, padded[offset : offset + n], out=out)
+    return out
 
 
 def compare_prices(
     current_price: float, last_price: float, tolerance_pct: float
 ) -> Optional[Literal["DOUBLE", "HIGHER", "LOWER"]]:
     """Compare two prices and return classification: 'DOUBLE', 'HIGHER', or 'LOWER'."""
-    if last_price <= 0 or not np.isfinite(last_price):
+    if not last_price > 0 or not math.isfinite(last_price):
         return None
 
     price_diff_pct = abs(current_price - last_price) / last_price
@@ -46,43 +97,122 @@ def compare_prices(
         return "LOWER"
 
 
+def _swing_code(
+    price: float, last_price: float, tolerance_pct: float, codes: tuple[int, int, int, int]
+) -> int:
+    """Pick from ``codes`` = (higher, lower, double, first) by comparing to the last swing."""
+    higher, lower, double, first = codes
+    if not last_price > 0 or not math.isfinite(last_price):
+        return first
+    if abs(price - last_price) / last_price <= tolerance_pct:
+        return double
+    return higher if price > last_price else lower
+
+
+def _swing_codes_batch(
+    prices: npt.NDArray[np.float64],
+    last_prices: npt.NDArray[np.float64],
+    tolerance_pct: float,
+    codes: tuple[int, int, int, int],
+) -> npt.NDArray[np.int8]:
+    """Vectorized _swing_code over aligned price arrays."""
+    higher, lower, double, first = codes
+    prices = np.asarray(prices, dtype=np.float64)
+    last_prices = np.asarray(last_prices, dtype=np.float64)
+    valid = (last_prices > 0) & np.isfinite(last_prices)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        is_double = np.abs(prices - last_prices) / last_prices <= tolerance_pct
+
+    out = np.where(prices > last_prices, higher, lower).astype(np.int8)
+    out[is_double & valid] = double
+    out[~valid] = first
+    return out
+
+
+def classify_swing_high_code(price: float, last_h_price: float, tolerance_pct: float) -> int:
+    """Classify a swing high and return its SWING_TYPES code (HH, LH, or DT)."""
+    return _swing_code(price, last_h_price, tolerance_pct, _SWING_HIGH_CODES)
+
+
+def classify_swing_low_code(price: float, last_l_price: float, tolerance_pct: float) -> int:
+    """Classify a swing low and return its SWING_TYPES code (HL, LL, or DB)."""
+    return _swing_code(price, last_l_price, tolerance_pct, _SWING_LOW_CODES)
+
+
+def classify_swing_high_batch(
+    prices: npt.NDArray[np.float64],
+    last_h_prices: npt.NDArray[np.float64],
+    tolerance_pct: float,
+) -> npt.NDArray[np.int8]:
+    """Vectorized classify_swing_high_code over aligned price arrays."""
+    return _swing_codes_batch(prices, last_h_prices, tolerance_pct, _SWING_HIGH_CODES)
+
+
+def classify_swing_low_batch(
+    prices: npt.NDArray[np.float64],
+    last_l_prices: npt.NDArray[np.float64],
+    tolerance_pct: float,
+) -> npt.NDArray[np.int8]:
+    """Vectorized classify_swing_low_code over aligned price arrays."""
+    return _swing_codes_batch(prices, last_l_prices, tolerance_pct, _SWING_LOW_CODES)
+
+
+def previous_values(arr: npt.NDArray[np.float64], first: float) -> npt.NDArray[np.float64]:
+    """Shift a 1-D array right by one, filling the first slot with ``first``."""
+    out = np.empty(len(arr), dtype=np.float64)
+    out[:1] = first
+    out[1:] = arr[:-1]
+    return out
+
+
 def classify_swing_high(
     price: float, last_h_price: float, tolerance_pct: float
 ) -> Literal["HH", "LH", "DT"]:
     """Classify a swing high as HH, LH, or DT."""
-    comparison = compare_prices(price, last_h_price, tolerance_pct)
-
-    if comparison is None:
-        return "HH"
-    elif comparison == "DOUBLE":
-        return "DT"
-    elif comparison == "HIGHER":
-        return "HH"
-    else:
-        return "LH"
+    code = classify_swing_high_code(price, last_h_price, tolerance_pct)
+    return cast(Literal["HH", "LH", "DT"], SWING_TYPES[code])
 
 
 def classify_swing_low(
     price: float, last_l_price: float, tolerance_pct: float
 ) -> Literal["HL", "LL", "DB"]:
     """Classify a swing low as HL, LL, or DB."""
-    comparison = compare_prices(price, last_l_price, tolerance_pct)
-
-    if comparison is None:
-        return "LL"
-    elif comparison == "DOUBLE":
-        return "DB"
-    elif comparison == "LOWER":
-        return "LL"
-    else:
-        return "HL"
+    code = classify_swing_low_code(price, last_l_price, tolerance_pct)
+    return cast(Literal["HL", "LL", "DB"], SWING_TYPES[code])
+
+
+def swing_type_categorical(codes: npt.NDArray[np.int8]) -> pd.Categorical:
+    """Build a swing_type Categorical from int8 codes (-1 = no swing)."""
+    return pd.Categorical.from_codes(codes, categories=SWING_TYPES)
 
 
 def merge_sorted_events(
-    high_indices: list[int], low_indices: list[int]
+    high_indices: Sequence[int] | npt.NDArray[np.intp],
+    low_indices: Sequence[int] | npt.NDArray[np.intp],
 ) -> list[tuple[int, Literal["high", "low"]]]:
-    """Merge and sort high/low swing events by time."""
+    """Merge and sort high/low swing events by time (labels or integer positions)."""
     events: list[tuple[int, Literal["high", "low"]]] = [(i, "high") for i in high_indices] + [
         (i, "low") for i in low_indices
     ]
     return sorted(events, key=lambda x: x[0])
+
+
+def merge_event_positions(
+    high_pos: npt.NDArray[np.intp], low_pos: npt.NDArray[np.intp]
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.int8]]:
+    """
+    Merge high/low swing positions into one time-ordered event stream.
+
+    Returns:
+        Tuple of (positions, tags) where tags holds EVENT_HIGH or EVENT_LOW.
+        Ties keep highs before lows, matching merge_sorted_events.
+    """
+    positions = np.concatenate([high_pos, low_pos]).astype(np.intp, copy=False)
+    tags = np.concatenate(
+        [
+            np.full(len(high_pos), EVENT_HIGH, dtype=np.int8),
+            np.full(len(low_pos), EVENT_LOW, dtype=np.int8),
+        ]
+    )
+    order = np.argsort(positions, kind="mergesort")
+    return positions[order], tags[order]
@@ -4,6 +4,10 @@ Bar features extraction module.
 Calculates single-bar and cross-bar features based on Al Brooks Price Action theory.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Sequence
+
 import numpy as np
 import pandas as pd
 
@@ -14,6 +18,7 @@ from ._bar_utils import (
     calculate_engulfing,
     calculate_failed_breakouts,
     calculate_tails,
+    rolling_mean,
     safe_divide_array,
 )
 
@@ -45,57 +50,59 @@ def compute_bar_features(
             - Cross-bar features: gap, inside/outside bars, engulfing
             - EMA features: dist_to_ema, bar_pos_ema, touches
     """
-    open_price = df["open"]
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
+    open_price = df["open"].to_numpy()
+    high = df["high"].to_numpy()
+    low = df["low"].to_numpy()
+    close = df["close"].to_numpy()
 
     total_range = high - low
-    body_size = (close - open_price).abs()
+    body_size = np.abs(close - open_price)
 
     safe_range = np.where(total_range == 0, np.nan, total_range)
 
     body_pct = body_size / safe_range
-    bar_color = np.sign(close - open_price).astype(int)
+    bar_color = np.sign(close - open_price).astype(np.int8)
 
     upper_tail, lower_tail = calculate_tails(high, open_price, close, low)
     upper_tail_pct = upper_tail / safe_range
     lower_tail_pct = lower_tail / safe_range
 
-    amplitude = total_range / open_price
-
-    avg_range_20 = total_range.rolling(window=20).mean()
-    rel_range_to_avg = total_range / avg_range_20
+    avg_range_20 = rolling_mean(total_range, 20)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amplitude = total_range / open_price
+        rel_range_to_avg = total_range / avg_range_20
     is_climax_bar = rel_range_to_avg > 2.0
 
     clv = (2 * close - high - low) / safe_range
     signed_body = (close - open_price) / safe_range
 
-    prev_open = df["open"].shift(1)
-    prev_high = df["high"].shift(1)
-    prev_low = df["low"].shift(1)
-    prev_close = df["close"].shift(1)
+    prev_open = df["open"].shift(1).to_numpy()
+    prev_high = df["high"].shift(1).to_numpy()
+    prev_low = df["low"].shift(1).to_numpy()
+    prev_close = df["close"].shift(1).to_numpy()
     prev_range = prev_high - prev_low
 
     safe_prev_close = np.where(prev_close == 0, np.nan, prev_close)
     safe_prev_range = np.where(prev_range == 0, np.nan, prev_range)
 
-    gap_ratio = open_price / prev_close
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap_ratio = open_price / prev_close
+        day_return_ratio = close / prev_close
+
     safe_gap_ratio = np.where((open_price > 0) & (prev_close > 0), gap_ratio, np.nan)
     gap = np.log(safe_gap_ratio)
 
-    day_return_ratio = close / prev_close
     safe_return_ratio = np.where((close > 0) & (prev_close > 0), day_return_ratio, np.nan)
     day_return = np.log(safe_return_ratio)
 
     true_range = np.maximum(
-        total_range, np.maximum((high - prev_close).abs(), (low - prev_close).abs())
+        total_range, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
     )
 
     rel_true_range = true_range / safe_prev_close
 
     safe_tr_val = np.where(true_range == 0, np.nan, true_range)
-    movement_efficiency = (close - prev_close).abs() / safe_tr_val
+    movement_efficiency = np.abs(close - prev_close) / safe_tr_val
 
     open_in_body = np.abs(gap) < 0.01
 
@@ -131,7 +138,7 @@ def compute_bar_features(
 
     is_strong_bear_reversal = (upper_tail_pct > 0.33) & (clv < -0.6) & (bar_color == -1)
 
-    trend_streak = calculate_consecutive_streak(is_trend_bar, bar_color, df)
+    trend_streak = calculate_consecutive_streak(is_trend_bar, bar_color)
 
     is_outside_up = is_outside & (close > prev_high)
     is_outside_down = is_outside & (close < prev_low)
@@ -149,7 +156,7 @@ def compute_bar_features(
     safe_blend_range = np.where(blend_range == 0, np.nan, blend_range)
 
     blend_clv = (2 * blend_close - blend_high - blend_low) / safe_blend_range
-    blend_body_size = (blend_close - blend_open).abs()
+    blend_body_size = np.abs(blend_close - blend_open)
     blend_body_pct = blend_body_size / safe_blend_range
 
     (
@@ -165,7 +172,7 @@ def compute_bar_features(
         ema = df["close"].ewm(span=ema_period, adjust=False).mean()
 
     dist_to_ema, bar_pos_ema, ema_touch, gap_below_ema, gap_above_ema = calculate_ema_features(
-        close, high, low, ema
+        close, high, low, ema.to_numpy()
     )
 
     result_dict = {
@@ -249,8 +256,34 @@ def add_bar_features(
     """
     features = compute_bar_features(df, doji_threshold, ema_period)
 
-    df = df.copy()
-    for col in features.columns:
-        df[f"{prefix}{col}"] = features[col].values
+    return df.assign(**{f"{prefix}{col}": features[col].to_numpy() for col in features.columns})
+
+
+def compute_bar_features_batch(
+    dfs: Sequence[pd.DataFrame],
+    doji_threshold: float = DOJI_BODY_THRESHOLD,
+    ema_period: int = 20,
+    max_workers: Optional[int] = None,
+) -> list[pd.DataFrame]:
+    """
+    Calculate bar features for several OHLC DataFrames on a thread pool.
+
+    Threads avoid pickling the frames, but only the NumPy sections can overlap;
+    the pandas and Python-level steps still hold the GIL, so the speed-up over
+    a plain loop is partial and not proportional to the number of cores.
+
+    Args:
+        dfs: DataFrames with 'open', 'high', 'low', 'close' columns
+        doji_threshold: Body percentage threshold for doji detection
+        ema_period: EMA period
+        max_workers: Maximum number of threads (ThreadPoolExecutor default if None)
+
+    Returns:
+        List of feature DataFrames in the same order as dfs
+    """
+    compute = partial(compute_bar_features, doji_threshold=doji_threshold, ema_period=ema_period)
+    if len(dfs) <= 1:
+        return [compute(df) for df in dfs]
 
-    return df
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(compute, dfs))
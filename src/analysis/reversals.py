@@ -81,9 +81,10 @@ def detect_climax_reversal(
     df["climax_top_price"] = np.where(is_v_top, high.shift(1), np.nan)
     df["climax_bottom_price"] = np.where(is_v_bottom, low.shift(1), np.nan)
 
-    v_top_count = is_v_top.sum()
-    v_bottom_count = is_v_bottom.sum()
-    logger.debug(f"Detected {v_top_count} V-Top and {v_bottom_count} V-Bottom reversals")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Detected %d V-Top and %d V-Bottom reversals", is_v_top.sum(), is_v_bottom.sum()
+        )
 
     return df
 
@@ -144,11 +145,12 @@ def detect_consecutive_reversal(df: pd.DataFrame, consecutive_count: int = 3) ->
             df.at[i, "consecutive_bull_start"] = True
             df.at[i, "consecutive_bottom_price"] = low.iloc[start_pos]
 
-    bear_count = is_bear_confirmed.sum()
-    bull_count = is_bull_confirmed.sum()
-    logger.debug(
-        f"Detected {bear_count} consecutive bear and {bull_count} consecutive bull reversals"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Detected %d consecutive bear and %d consecutive bull reversals",
+            is_bear_confirmed.sum(),
+            is_bull_confirmed.sum(),
+        )
 
     df.drop(["bear_streak", "bull_streak"], axis=1, inplace=True)
 
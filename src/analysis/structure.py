@@ -109,7 +109,7 @@ def compute_market_structure(
         DataFrame with all structure features
     """
     result = detect_swings(df, window=swing_window)
-    result = classify_swings(result)
+    result = classify_swings(result, copy=False)
     result = compute_trend_state(result, lookback=trend_lookback)
 
     return result
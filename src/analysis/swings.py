@@ -17,11 +17,17 @@ logger = logging.getLogger(__name__)
 
 from ._structure_utils import (
     DEFAULT_SWING_WINDOW,
+    EVENT_HIGH,
     PRICE_TOLERANCE_PCT,
-    classify_swing_high,
-    classify_swing_low,
+    SWING_TYPE_CODES,
+    centered_extremum,
+    classify_swing_high_batch,
+    classify_swing_low_batch,
     detect_duplicates,
-    merge_sorted_events,
+    forward_fill,
+    merge_event_positions,
+    previous_values,
+    swing_type_categorical,
 )
 
 
@@ -30,6 +36,7 @@ def detect_swings(
     window: int = DEFAULT_SWING_WINDOW,
     high_col: str = "high",
     low_col: str = "low",
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Detect swing highs and lows using Al Brooks fractal method.
@@ -42,6 +49,7 @@ def detect_swings(
         window: Confirmation period (bars before/after for swing detection)
         high_col: Name of high price column
         low_col: Name of low price column
+        copy: If False, add columns to ``df`` in place instead of to a copy
 
     Returns:
         DataFrame with added columns:
@@ -52,21 +60,19 @@ def detect_swings(
             - plot_swing_high: float (for chart visualization)
             - plot_swing_low: float
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
 
-    highs = df[high_col]
-    lows = df[low_col]
+    # Swings are exact-equality hits against the window extreme, so the scan
+    # stays in float64: a narrower dtype can merge distinct prices into ties
+    highs = df[high_col].to_numpy(dtype=np.float64)
+    lows = df[low_col].to_numpy(dtype=np.float64)
 
-    scan_window = 2 * window + 1
+    rolling_max = centered_extremum(highs, window, "max")
+    rolling_min = centered_extremum(lows, window, "min")
 
-    rolling_max = highs.rolling(window=scan_window, center=True, min_periods=1).max()
-    rolling_min = lows.rolling(window=scan_window, center=True, min_periods=1).min()
-
-    is_high_raw = (highs == rolling_max) & highs.notna()
-    is_low_raw = (lows == rolling_min) & lows.notna()
-
-    is_high_arr = is_high_raw.to_numpy()
-    is_low_arr = is_low_raw.to_numpy()
+    is_high_arr = (highs == rolling_max) & ~np.isnan(highs)
+    is_low_arr = (lows == rolling_min) & ~np.isnan(lows)
 
     is_high_dedup = detect_duplicates(is_high_arr)
     is_low_dedup = detect_duplicates(is_low_arr)
@@ -79,23 +85,40 @@ def detect_swings(
     df["swing_high_confirmed"] = shifted_high_arr
     df["swing_low_confirmed"] = shifted_low_arr
 
-    df["swing_high_price"] = highs.shift(window)
-    df["swing_low_price"] = lows.shift(window)
-
-    df.loc[~df["swing_high_confirmed"], "swing_high_price"] = np.nan
-    df.loc[~df["swing_low_confirmed"], "swing_low_price"] = np.nan
-
-    df["plot_swing_high"] = df["swing_high_price"].shift(-window)
-    df["plot_swing_low"] = df["swing_low_price"].shift(-window)
-
-    high_count = shifted_high_arr.sum()
-    low_count = shifted_low_arr.sum()
-    logger.debug(f"Detected {high_count} swing highs and {low_count} swing lows (window={window})")
+    n = len(df)
+    lag = max(n - window, 0)
+
+    highs_shifted = np.full(n, np.nan)
+    highs_shifted[window:] = highs[:lag]
+    lows_shifted = np.full(n, np.nan)
+    lows_shifted[window:] = lows[:lag]
+
+    swing_high_price = np.where(shifted_high_arr, highs_shifted, np.nan)
+    swing_low_price = np.where(shifted_low_arr, lows_shifted, np.nan)
+    df["swing_high_price"] = swing_high_price
+    df["swing_low_price"] = swing_low_price
+
+    plot_swing_high = np.full(n, np.nan)
+    plot_swing_high[:lag] = swing_high_price[window:]
+    plot_swing_low = np.full(n, np.nan)
+    plot_swing_low[:lag] = swing_low_price[window:]
+    df["plot_swing_high"] = plot_swing_high
+    df["plot_swing_low"] = plot_swing_low
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Detected %d swing highs and %d swing lows (window=%d)",
+            shifted_high_arr.sum(),
+            shifted_low_arr.sum(),
+            window,
+        )
 
     return df
 
 
-def classify_swings(df: pd.DataFrame, tolerance_pct: float = PRICE_TOLERANCE_PCT) -> pd.DataFrame:
+def classify_swings(
+    df: pd.DataFrame, tolerance_pct: float = PRICE_TOLERANCE_PCT, copy: bool = True
+) -> pd.DataFrame:
     """
     Classify swings as HH, LH, HL, LL, DT, or DB.
 
@@ -104,64 +127,66 @@ def classify_swings(df: pd.DataFrame, tolerance_pct: float = PRICE_TOLERANCE_PCT
     Args:
         df: DataFrame with swing detection results
         tolerance_pct: Price tolerance for identifying double tops/bottoms
+        copy: If False, add columns to ``df`` in place instead of to a copy
 
     Returns:
         DataFrame with added columns:
-            - swing_type: str (HH, LH, HL, LL, DT, DB)
+            - swing_type: category (HH, LH, HL, LL, DT, DB)
             - major_high: float (current resistance level)
             - major_low: float (current support level)
     """
     if "swing_high_confirmed" not in df.columns:
-        df = detect_swings(df)
+        df = detect_swings(df, copy=copy)
+    elif copy:
+        df = df.copy()
 
-    df = df.copy()
-
-    df["swing_type"] = pd.Series([np.nan] * len(df), dtype=object)
+    swing_type_codes = np.full(len(df), -1, dtype=np.int8)
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
     df["major_high"] = np.nan
     df["major_low"] = np.nan
 
-    last_h_price = -np.inf
-    last_l_price = np.inf
-
     current_major_high = np.nan
     current_major_low = np.nan
 
-    high_indices = df.index[df["swing_high_confirmed"]].tolist()
-    low_indices = df.index[df["swing_low_confirmed"]].tolist()
-
-    events = merge_sorted_events(high_indices, low_indices)
-
-    for idx, event_type in events:
-        if event_type == "high":
-            curr_price = df.at[idx, "swing_high_price"]
-            label = classify_swing_high(curr_price, last_h_price, tolerance_pct)
-
-            last_h_price = curr_price
-            df.at[idx, "swing_type"] = label
-
-            current_major_high = curr_price
-            df.at[idx, "major_high"] = current_major_high
-            df.at[idx, "major_low"] = current_major_low
-
-        elif event_type == "low":
-            curr_price = df.at[idx, "swing_low_price"]
-            label = classify_swing_low(curr_price, last_l_price, tolerance_pct)
-
-            last_l_price = curr_price
-            df.at[idx, "swing_type"] = label
+    high_pos = np.flatnonzero(df["swing_high_confirmed"].to_numpy())
+    low_pos = np.flatnonzero(df["swing_low_confirmed"].to_numpy())
+    swing_high_prices = df["swing_high_price"].to_numpy()
+    swing_low_prices = df["swing_low_price"].to_numpy()
+
+    # Each swing is classified against the previous swing of the same kind
+    high_prices = swing_high_prices[high_pos]
+    low_prices = swing_low_prices[low_pos]
+    swing_type_codes[high_pos] = classify_swing_high_batch(
+        high_prices, previous_values(high_prices, -np.inf), tolerance_pct
+    )
+    swing_type_codes[low_pos] = classify_swing_low_batch(
+        low_prices, previous_values(low_prices, np.inf), tolerance_pct
+    )
+
+    # Per-event outputs: columns are (major_high, major_low)
+    levels = np.full((len(df), 2), np.nan)
+
+    event_pos, event_tags = merge_event_positions(high_pos, low_pos)
+
+    for i in range(len(event_pos)):
+        pos = event_pos[i]
+        if event_tags[i] == EVENT_HIGH:
+            current_major_high = swing_high_prices[pos]
+        else:
+            current_major_low = swing_low_prices[pos]
 
-            current_major_low = curr_price
-            df.at[idx, "major_low"] = current_major_low
-            df.at[idx, "major_high"] = current_major_high
+        levels[pos, 0] = current_major_high
+        levels[pos, 1] = current_major_low
 
-    df["major_high"] = df["major_high"].ffill()
-    df["major_low"] = df["major_low"].ffill()
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
+    df["major_high"] = forward_fill(levels[:, 0])
+    df["major_low"] = forward_fill(levels[:, 1])
 
     return df
 
 
 def classify_swings_v2(
-    df: pd.DataFrame, tolerance_pct: float = PRICE_TOLERANCE_PCT
+    df: pd.DataFrame, tolerance_pct: float = PRICE_TOLERANCE_PCT, copy: bool = True
 ) -> pd.DataFrame:
     """
     Classify swings with breakout confirmation logic.
@@ -172,47 +197,70 @@ def classify_swings_v2(
     Args:
         df: DataFrame with swing detection results
         tolerance_pct: Price tolerance for double tops/bottoms
+        copy: If False, add columns to ``df`` in place instead of to a copy
 
     Returns:
         DataFrame with columns:
-            - swing_type: str
+            - swing_type: category (HH, LH, HL, LL, DT, DB)
             - major_high, major_low: float
             - trend_bias: int (1=Bull, -1=Bear, 0=Neutral)
     """
     if "swing_high_confirmed" not in df.columns:
-        df = detect_swings(df)
+        df = detect_swings(df, copy=copy)
+    elif copy:
+        df = df.copy()
 
-    df = df.copy()
-
-    df["swing_type"] = pd.Series([np.nan] * len(df), dtype=object)
+    swing_type_codes = np.full(len(df), -1, dtype=np.int8)
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
     df["major_high"] = np.nan
     df["major_low"] = np.nan
     df["trend_bias"] = 0
 
-    last_h_price = -np.inf
-    last_l_price = np.inf
-
     candidate_major_low = np.nan
     candidate_major_high = np.nan
 
-    first_valid_high = df["high"].dropna().iloc[0] if df["high"].notna().any() else np.nan
-    first_valid_low = df["low"].dropna().iloc[0] if df["low"].notna().any() else np.nan
+    highs = df["high"].to_numpy(dtype=np.float64)
+    lows = df["low"].to_numpy(dtype=np.float64)
+    valid_high = ~np.isnan(highs)
+    valid_low = ~np.isnan(lows)
+    first_valid_high = highs[valid_high.argmax()] if valid_high.any() else np.nan
+    first_valid_low = lows[valid_low.argmax()] if valid_low.any() else np.nan
     active_major_high = first_valid_high
     active_major_low = first_valid_low
 
     curr_bias = 0
 
-    high_indices = df.index[df["swing_high_confirmed"]].tolist()
-    low_indices = df.index[df["swing_low_confirmed"]].tolist()
-    events = merge_sorted_events(high_indices, low_indices)
-
-    for idx, event_type in events:
-        if event_type == "high":
-            price = df.at[idx, "swing_high_price"]
-
-            label = classify_swing_high(price, last_h_price, tolerance_pct)
-            last_h_price = price
-            df.at[idx, "swing_type"] = label
+    high_pos = np.flatnonzero(df["swing_high_confirmed"].to_numpy())
+    low_pos = np.flatnonzero(df["swing_low_confirmed"].to_numpy())
+    swing_high_prices = df["swing_high_price"].to_numpy()
+    swing_low_prices = df["swing_low_price"].to_numpy()
+
+    high_prices = swing_high_prices[high_pos]
+    low_prices = swing_low_prices[low_pos]
+    high_codes = classify_swing_high_batch(
+        high_prices, previous_values(high_prices, -np.inf), tolerance_pct
+    )
+    low_codes = classify_swing_low_batch(
+        low_prices, previous_values(low_prices, np.inf), tolerance_pct
+    )
+    swing_type_codes[high_pos] = high_codes
+    swing_type_codes[low_pos] = low_codes
+
+    # Per-event outputs: columns are (major_high, major_low, trend_bias)
+    levels = np.full((len(df), 3), np.nan)
+
+    event_pos, event_tags = merge_event_positions(high_pos, low_pos)
+    # The merge is stable, so each kind's codes keep their order in the event stream
+    is_high_event = event_tags == EVENT_HIGH
+    event_codes = np.empty(len(event_pos), dtype=np.int8)
+    event_codes[is_high_event] = high_codes
+    event_codes[~is_high_event] = low_codes
+
+    for i in range(len(event_pos)):
+        pos = event_pos[i]
+        code = event_codes[i]
+        if event_tags[i] == EVENT_HIGH:
+            price = swing_high_prices[pos]
 
             candidate_major_high = price
 
@@ -229,15 +277,11 @@ def classify_swings_v2(
                     active_major_high = price
             else:
                 active_major_high = price
-                if label == "HH":
+                if code == SWING_TYPE_CODES["HH"]:
                     curr_bias = 1
 
-        elif event_type == "low":
-            price = df.at[idx, "swing_low_price"]
-
-            label = classify_swing_low(price, last_l_price, tolerance_pct)
-            last_l_price = price
-            df.at[idx, "swing_type"] = label
+        else:
+            price = swing_low_prices[pos]
 
             candidate_major_low = price
 
@@ -254,22 +298,26 @@ def classify_swings_v2(
                     active_major_low = price
             else:
                 active_major_low = price
-                if label == "LL":
+                if code == SWING_TYPE_CODES["LL"]:
                     curr_bias = -1
 
-        df.at[idx, "major_high"] = active_major_high
-        df.at[idx, "major_low"] = active_major_low
-        df.at[idx, "trend_bias"] = curr_bias
+        levels[pos, 0] = active_major_high
+        levels[pos, 1] = active_major_low
+        levels[pos, 2] = curr_bias
 
-    df["major_high"] = df["major_high"].ffill()
-    df["major_low"] = df["major_low"].ffill()
-    df["trend_bias"] = df["trend_bias"].ffill().fillna(0).astype(int)
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
+    df["major_high"] = forward_fill(levels[:, 0])
+    df["major_low"] = forward_fill(levels[:, 1])
+    df["trend_bias"] = np.nan_to_num(levels[:, 2], nan=0.0).astype(int)
 
     return df
 
 
 def classify_swings_v3(
-    df: pd.DataFrame, window: int = DEFAULT_SWING_WINDOW, tolerance_pct: float = PRICE_TOLERANCE_PCT
+    df: pd.DataFrame,
+    window: int = DEFAULT_SWING_WINDOW,
+    tolerance_pct: float = PRICE_TOLERANCE_PCT,
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Classify swings with bar-by-bar close-based breakout detection.
@@ -281,26 +329,25 @@ def classify_swings_v3(
         df: DataFrame with OHLC data
         window: Swing detection window
         tolerance_pct: Price tolerance for double tops/bottoms
+        copy: If False, add columns to ``df`` in place instead of to a copy
 
     Returns:
         DataFrame with columns:
-            - swing_type: str
+            - swing_type: category (HH, LH, HL, LL, DT, DB)
             - major_high, major_low: float (active only during trend)
             - market_trend: int (1=Bull, -1=Bear, 0=Neutral)
     """
     if "swing_high_confirmed" not in df.columns:
-        df = detect_swings(df, window=window)
-
-    df = df.copy()
+        df = detect_swings(df, window=window, copy=copy)
+    elif copy:
+        df = df.copy()
 
-    df["swing_type"] = pd.Series([np.nan] * len(df), dtype=object)
+    swing_type_codes = np.full(len(df), -1, dtype=np.int8)
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
     df["major_high"] = np.nan
     df["major_low"] = np.nan
     df["market_trend"] = 0
 
-    last_h_price = -np.inf
-    last_l_price = np.inf
-
     last_swing_high = np.nan
     last_swing_low = np.nan
 
@@ -319,18 +366,25 @@ def classify_swings_v3(
     swing_high_prices = df["swing_high_price"].values
     swing_low_prices = df["swing_low_price"].values
 
+    # Swing labels depend only on the previous swing of the same kind
+    high_pos = np.flatnonzero(swing_high_confirmed)
+    low_pos = np.flatnonzero(swing_low_confirmed)
+    high_prices = swing_high_prices[high_pos]
+    low_prices = swing_low_prices[low_pos]
+    swing_type_codes[high_pos] = classify_swing_high_batch(
+        high_prices, previous_values(high_prices, -np.inf), tolerance_pct
+    )
+    swing_type_codes[low_pos] = classify_swing_low_batch(
+        low_prices, previous_values(low_prices, np.inf), tolerance_pct
+    )
+
     major_high_arr = np.full(len(df), np.nan)
     major_low_arr = np.full(len(df), np.nan)
     trend_arr = np.zeros(len(df), dtype=int)
-    swing_type_arr = np.empty(len(df), dtype=object)
-    swing_type_arr[:] = np.nan
 
     for i in range(len(df)):
         if swing_high_confirmed[i]:
             price = swing_high_prices[i]
-            swing_type_arr[i] = classify_swing_high(price, last_h_price, tolerance_pct)
-
-            last_h_price = price
             last_swing_high = price
 
             if trend == -1:
@@ -338,9 +392,6 @@ def classify_swings_v3(
 
         if swing_low_confirmed[i]:
             price = swing_low_prices[i]
-            swing_type_arr[i] = classify_swing_low(price, last_l_price, tolerance_pct)
-
-            last_l_price = price
             last_swing_low = price
 
             if trend == 1:
@@ -368,12 +419,9 @@ def classify_swings_v3(
 
         trend_arr[i] = trend
 
-    df["swing_type"] = swing_type_arr
-    df["major_high"] = major_high_arr
-    df["major_low"] = major_low_arr
+    df["swing_type"] = swing_type_categorical(swing_type_codes)
+    df["major_high"] = forward_fill(major_high_arr)
+    df["major_low"] = forward_fill(major_low_arr)
     df["market_trend"] = trend_arr
 
-    df["major_high"] = df["major_high"].ffill()
-    df["major_low"] = df["major_low"].ffill()
-
     return df
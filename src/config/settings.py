@@ -6,6 +6,7 @@ Supports loading from YAML files and environment variable overrides.
 
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 from typing import Any, Optional
@@ -13,6 +14,23 @@ from typing import Any, Optional
 import yaml
 from pydantic import BaseModel, Field
 
+# libyaml-backed loader and dumper when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Environment variable -> (section or key, nested key or None, converter)
+_ENV_OVERRIDES: dict[str, tuple[str, Optional[str], Any]] = {
+    "APP_CONFIG_ANALYSIS_SWING_WINDOW": ("analysis", "swing_window", int),
+    "APP_CONFIG_ANALYSIS_PRICE_TOLERANCE_PCT": ("analysis", "price_tolerance_pct", float),
+    "APP_CONFIG_ANALYSIS_MIN_DIST": ("analysis", "min_dist", int),
+    "APP_CONFIG_LOG_LEVEL": ("log_level", None, str),
+    "APP_CONFIG_LOG_TO_FILE": (
+        "log_to_file",
+        None,
+        lambda x: x.lower() in ("true", "1", "yes"),
+    ),
+}
+
 
 class AnalysisConfig(BaseModel):
     """Analysis parameters configuration."""
@@ -111,7 +129,7 @@ class AppConfig(BaseModel):
             raise FileNotFoundError(f"Configuration file not found: {path}")
 
         with open(path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YAML_LOADER)
 
         if data is None:
             data = {}
@@ -119,13 +137,16 @@ class AppConfig(BaseModel):
         # Apply environment variable overrides
         data = cls._apply_env_overrides(data)
 
-        return cls(**data)
+        return cls.model_validate(data)
 
     @classmethod
     def from_yaml_or_default(cls, path: str | Path | None = None) -> AppConfig:
         """
         Load configuration from YAML file or use defaults.
 
+        Validated configs are cached by (path, mtime, environment overrides);
+        each call returns an independent copy of the cached instance.
+
         Args:
             path: Optional path to YAML configuration file
 
@@ -145,12 +166,19 @@ class AppConfig(BaseModel):
                     path = default_path
                     break
 
-        if path and Path(path).exists():
-            return cls.from_yaml(path)
+        env_sig = tuple(os.getenv(env_var) for env_var in _ENV_OVERRIDES)
+
+        path_str: Optional[str] = None
+        mtime_ns: Optional[int] = None
+        if path:
+            try:
+                resolved = Path(path).resolve()
+                mtime_ns = resolved.stat().st_mtime_ns
+                path_str = str(resolved)
+            except OSError:
+                pass
 
-        # Use defaults with environment overrides
-        data = cls._apply_env_overrides({})
-        return cls(**data)
+        return _load_config_cached(cls, path_str, mtime_ns, env_sig).model_copy(deep=True)
 
     @classmethod
     def _apply_env_overrides(cls, data: dict[str, Any]) -> dict[str, Any]:
@@ -164,19 +192,7 @@ class AppConfig(BaseModel):
         if "analysis" not in data:
             data["analysis"] = {}
 
-        env_mappings = {
-            "APP_CONFIG_ANALYSIS_SWING_WINDOW": ("analysis", "swing_window", int),
-            "APP_CONFIG_ANALYSIS_PRICE_TOLERANCE_PCT": ("analysis", "price_tolerance_pct", float),
-            "APP_CONFIG_ANALYSIS_MIN_DIST": ("analysis", "min_dist", int),
-            "APP_CONFIG_LOG_LEVEL": ("log_level", None, str),
-            "APP_CONFIG_LOG_TO_FILE": (
-                "log_to_file",
-                None,
-                lambda x: x.lower() in ("true", "1", "yes"),
-            ),
-        }
-
-        for env_var, mapping in env_mappings.items():
+        for env_var, mapping in _ENV_OVERRIDES.items():
             env_value = os.getenv(env_var)
             if env_value is not None:
                 if len(mapping) == 3 and mapping[1] is not None:
@@ -201,4 +217,26 @@ class AppConfig(BaseModel):
         path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(path, "w") as f:
-            yaml.dump(self.model_dump(), f, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                self.model_dump(),
+                f,
+                Dumper=_YAML_DUMPER,
+                default_flow_style=False,
+                sort_keys=False,
+            )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(
+    cls: type[AppConfig],
+    path_str: Optional[str],
+    mtime_ns: Optional[int],
+    env_sig: tuple[Optional[str], ...],
+) -> AppConfig:
+    """Build an AppConfig from YAML or defaults (cached; callers must copy)."""
+    if path_str is not None:
+        return cls.from_yaml(path_str)
+
+    # Use defaults with environment overrides
+    data = cls._apply_env_overrides({})
+    return cls.model_validate(data)
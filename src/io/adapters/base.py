@@ -4,11 +4,15 @@ adapters/base.py
 """
 
 from abc import ABC, abstractmethod
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from ..schema import OHLCData
 
+# 安装了 python-calamine 时用其 Rust 实现读取 Excel，否则交给 pandas 按扩展名选择引擎
+EXCEL_ENGINE: Optional[str] = "calamine" if find_spec("python_calamine") is not None else None
+
 
 class DataAdapter(ABC):
     """
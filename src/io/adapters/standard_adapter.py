@@ -6,6 +6,7 @@ adapters/standard_adapter.py
 这通常用于加载由 fetch_data.py 获取并保存的数据。
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Union
 
@@ -21,7 +22,13 @@ from ..schema import (
     REQUIRED_COLUMNS,
     OHLCData,
 )
-from .base import DataAdapter
+from .base import EXCEL_ENGINE, DataAdapter
+
+# 标准 CSV 中价格列的读取类型
+_PRICE_DTYPES = {col: "float64" for col in (COL_OPEN, COL_HIGH, COL_LOW, COL_CLOSE)}
+
+# 安装了 pyarrow 时使用其多线程 CSV 解析器，否则回退到 pandas C 解析器
+_CSV_ENGINE = "pyarrow" if find_spec("pyarrow") is not None else "c"
 
 
 class StandardAdapter(DataAdapter):
@@ -49,7 +56,7 @@ class StandardAdapter(DataAdapter):
             path = Path(path)
             if path.suffix.lower() in [".xlsx", ".xls"]:
                 # Excel 需要读取一点数据来获取 columns
-                df = pd.read_excel(path, nrows=0)
+                df = pd.read_excel(path, engine=EXCEL_ENGINE, nrows=0)
             else:
                 df = pd.read_csv(path, nrows=0)
 
@@ -75,12 +82,20 @@ class StandardAdapter(DataAdapter):
 
         # 读取数据
         if path.suffix.lower() in [".xlsx", ".xls"]:
-            df = pd.read_excel(path)
+            df = pd.read_excel(path, engine=EXCEL_ENGINE)
         else:
-            df = pd.read_csv(path)
-
-        # 确保 datetime 列是 datetime 类型
-        if COL_DATETIME in df.columns:
+            # CSV: 价格列直接按 float64 解析，日期列在解析器中转换，避免类型推断和二次转换
+            df = pd.read_csv(
+                path,
+                engine=_CSV_ENGINE,
+                dtype=_PRICE_DTYPES,
+                parse_dates=[COL_DATETIME],
+            )
+
+        # 确保 datetime 列是 datetime 类型 (CSV 已在读取时解析)
+        if COL_DATETIME in df.columns and not pd.api.types.is_datetime64_any_dtype(
+            df[COL_DATETIME]
+        ):
             df[COL_DATETIME] = pd.to_datetime(df[COL_DATETIME])
 
         # 按日期排序
@@ -14,7 +14,7 @@ from typing import Union
 import pandas as pd
 
 from ..schema import COL_CLOSE, COL_DATETIME, COL_HIGH, COL_LOW, COL_OPEN, COL_VOLUME, OHLCData
-from .base import DataAdapter
+from .base import EXCEL_ENGINE, DataAdapter
 
 
 class WindCFEAdapter(DataAdapter):
@@ -63,7 +63,7 @@ class WindCFEAdapter(DataAdapter):
 
         # 根据扩展名选择读取方式
         if path.suffix.lower() in [".xlsx", ".xls"]:
-            df = pd.read_excel(path)
+            df = pd.read_excel(path, engine=EXCEL_ENGINE)
         else:
             # CSV 尝试多种编码
             try:
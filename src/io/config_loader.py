@@ -1,20 +1,61 @@
 """Configuration loading utilities."""
 
 import ast
+import functools
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, FrozenSet, Optional, Tuple
 
 
 def load_api_config() -> Dict[str, str]:
     """
     Load API configuration from data_config.py.
 
+    The parsed result is cached and only re-parsed when the file's mtime changes.
+
     Returns:
         Dict mapping filename to security name
     """
+    key = _api_config_key()
+    if key is None:
+        return {}
+
+    return dict(_parse_api_config(*key))
+
+
+def load_api_filenames() -> FrozenSet[str]:
+    """
+    Load the set of data filenames produced by the API configuration.
+
+    Returns:
+        Frozen set of filenames (cached alongside load_api_config)
+    """
+    key = _api_config_key()
+    if key is None:
+        return frozenset()
+
+    return _api_filenames(*key)
+
+
+def _api_config_key() -> Optional[Tuple[Path, int]]:
+    """Return (path, mtime_ns) of data_config.py, or None if it cannot be stat'ed."""
     config_path = Path(__file__).parent / "data_config.py"
 
+    try:
+        return config_path, config_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _api_filenames(config_path: Path, mtime_ns: int) -> FrozenSet[str]:
+    """Filename set of the parsed API config (cached per path + mtime)."""
+    return frozenset(_parse_api_config(config_path, mtime_ns))
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_api_config(config_path: Path, mtime_ns: int) -> Dict[str, str]:
+    """Parse DATA_SOURCES from data_config.py (cached per path + mtime)."""
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             source = f.read()
@@ -48,13 +89,24 @@ def load_security_cache() -> Dict[str, str]:
     """
     Load security names from cache file.
 
+    The parsed result is cached and only re-read when the file's mtime changes.
+
     Returns:
         Dict mapping symbol to security name
     """
     cache_file = Path("data") / "security_names.json"
-    if not cache_file.exists():
+
+    try:
+        mtime_ns = cache_file.stat().st_mtime_ns
+    except OSError:
         return {}
 
+    return dict(_read_security_cache(cache_file.resolve(), mtime_ns))
+
+
+@functools.lru_cache(maxsize=1)
+def _read_security_cache(cache_file: Path, mtime_ns: int) -> Dict[str, str]:
+    """Read security_names.json (cached per path + mtime)."""
     try:
         with open(cache_file, "r", encoding="utf-8") as f:
             return json.load(f)
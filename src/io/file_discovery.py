@@ -1,25 +1,46 @@
 """File discovery and selection utilities."""
 
+import os
 import re
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from .config_loader import load_api_config, load_security_cache
+from .config_loader import load_api_config, load_api_filenames, load_security_cache
 
 SUPPORTED_EXTENSIONS = {".xlsx", ".xls", ".csv"}
-WIND_FILE_PATTERN = re.compile(r"^[a-zA-Z0-9.]+_[a-zA-Z]+\.xlsx$", re.IGNORECASE)
+WIND_FILE_PATTERN = re.compile(r"^[a-zA-Z0-9.]+_[a-zA-Z]+\.xlsx$", re.IGNORECASE | re.ASCII)
 
 
-def find_data_files(directory: Path) -> List[Path]:
-    """Scan directory for supported data files."""
+def scan_data_files(directory: Path) -> List[Tuple[Path, int]]:
+    """
+    Scan directory for supported data files together with their sizes.
+
+    Sizes are read once here via DirEntry.stat() (still one stat per file except
+    on Windows), so display_file_menu does not stat each file a second time.
+    Extensions match case-insensitively, as in DataAdapter.can_handle, and
+    directories whose names end in a supported extension are skipped.
+
+    Returns:
+        List of (path, size_in_bytes) sorted by lower-cased filename
+    """
     if not directory.exists():
         return []
 
-    files = []
-    for ext in SUPPORTED_EXTENSIONS:
-        files.extend(directory.glob(f"*{ext}"))
-    return sorted(files, key=lambda x: x.name.lower())
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            if not entry.is_file():
+                continue
+            entries.append((Path(entry.path), entry.stat().st_size))
+    return sorted(entries, key=lambda x: x[0].name.lower())
+
+
+def find_data_files(directory: Path) -> List[Path]:
+    """Scan directory for supported data files."""
+    return [path for path, _ in scan_data_files(directory)]
 
 
 def categorize_files(files: List[Path]) -> Tuple[List[Path], List[Path]]:
@@ -29,14 +50,14 @@ def categorize_files(files: List[Path]) -> Tuple[List[Path], List[Path]]:
     Returns:
         Tuple of (api_files, user_files)
     """
-    api_config = load_api_config()
-    api_filenames = set(api_config.keys())
+    api_filenames = load_api_filenames()
+    wind_match = WIND_FILE_PATTERN.match
 
     api_files = []
     user_files = []
 
     for f in files:
-        if f.name in api_filenames or WIND_FILE_PATTERN.match(f.name):
+        if f.name in api_filenames or wind_match(f.name):
             api_files.append(f)
         else:
             user_files.append(f)
@@ -44,10 +65,30 @@ def categorize_files(files: List[Path]) -> Tuple[List[Path], List[Path]]:
     return api_files, user_files
 
 
-def display_file_menu(api_files: List[Path], user_files: List[Path]) -> None:
-    """Display interactive file selection menu."""
-    api_config = load_api_config()
-    cache_data = load_security_cache()
+def display_file_menu(
+    api_files: List[Path],
+    user_files: List[Path],
+    api_config: Optional[Dict[str, str]] = None,
+    cache_data: Optional[Dict[str, str]] = None,
+    file_sizes: Optional[Dict[Path, int]] = None,
+) -> None:
+    """
+    Display interactive file selection menu.
+
+    Args:
+        api_files: Files sourced from the Wind API
+        user_files: Files provided manually by the user
+        api_config: Filename -> security name mapping (loaded if None)
+        cache_data: Symbol -> security name cache (loaded if None)
+        file_sizes: Optional precomputed sizes in bytes (e.g. from scan_data_files);
+            files missing from the mapping are stat'ed
+    """
+    if api_config is None:
+        api_config = load_api_config()
+    if cache_data is None:
+        cache_data = load_security_cache()
+    if file_sizes is None:
+        file_sizes = {}
 
     print("\n📂 请选择要处理的数据文件:\n")
 
@@ -57,7 +98,7 @@ def display_file_menu(api_files: List[Path], user_files: List[Path]) -> None:
         print("  --- 🌏 来自 Wind API ---")
 
         for f in api_files:
-            size_kb = f.stat().st_size / 1024
+            size_kb = _file_size(f, file_sizes) / 1024
             comment = ""
 
             if f.name in api_config:
@@ -74,7 +115,7 @@ def display_file_menu(api_files: List[Path], user_files: List[Path]) -> None:
     if user_files:
         print("  --- 👤 用户手工提供 ---")
         for f in user_files:
-            size_kb = f.stat().st_size / 1024
+            size_kb = _file_size(f, file_sizes) / 1024
             print(f"  [{current_idx}] {f.name:<20} ({size_kb:.1f} KB)")
             current_idx += 1
 
@@ -82,6 +123,14 @@ def display_file_menu(api_files: List[Path], user_files: List[Path]) -> None:
     print(f"  提示: 输入多个序号可用空格或逗号分隔 (如: 1 2 3)\n")
 
 
+def _file_size(path: Path, file_sizes: Dict[Path, int]) -> int:
+    """Return the cached size of a file, falling back to stat()."""
+    size = file_sizes.get(path)
+    if size is None:
+        size = path.stat().st_size
+    return size
+
+
 def parse_user_selection(raw_input: str, all_files: List[Path]) -> List[Path]:
     """
     Parse user input and return selected files.
@@ -113,7 +162,8 @@ def select_files_interactive(data_dir: Path) -> List[str]:
     Returns:
         List of selected file paths as strings
     """
-    files = find_data_files(data_dir)
+    scanned = scan_data_files(data_dir)
+    files = [path for path, _ in scanned]
 
     if not files:
         print(f"❌ 目录 '{data_dir}' 下没有找到可处理的数据文件")
@@ -128,7 +178,13 @@ def select_files_interactive(data_dir: Path) -> List[str]:
     api_files, user_files = categorize_files(files)
     all_files = api_files + user_files
 
-    display_file_menu(api_files, user_files)
+    display_file_menu(
+        api_files,
+        user_files,
+        api_config=load_api_config(),
+        cache_data=load_security_cache(),
+        file_sizes=dict(scanned),
+    )
 
     while True:
         try:
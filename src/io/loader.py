@@ -31,6 +31,26 @@ ADAPTERS: dict[str, DataAdapter] = {
     "wind_cfe": WindCFEAdapter(),
 }
 
+# 按扩展名索引的适配器候选列表 (保持 ADAPTERS 的注册顺序)
+_BY_EXT: dict[str, list[DataAdapter]] = {}
+
+# 构建 _BY_EXT 时 ADAPTERS 的快照 (名称与适配器 id)，用于发现直接修改 ADAPTERS 的情况
+# (被替换的旧适配器仍由 _BY_EXT 引用，其 id 不会在重建前被复用)
+_BY_EXT_SNAPSHOT: tuple[tuple[str, int], ...] = ()
+
+
+def _extension_index() -> dict[str, list[DataAdapter]]:
+    """返回扩展名索引，ADAPTERS 自上次构建后有变化时先重建"""
+    global _BY_EXT_SNAPSHOT
+    snapshot = tuple((name, id(adp)) for name, adp in ADAPTERS.items())
+    if snapshot != _BY_EXT_SNAPSHOT:
+        _BY_EXT.clear()
+        for adp in ADAPTERS.values():
+            for ext in adp.supported_extensions:
+                _BY_EXT.setdefault(ext.lower(), []).append(adp)
+        _BY_EXT_SNAPSHOT = snapshot
+    return _BY_EXT
+
 
 def load_ohlc(path: str | Path, adapter: Optional[str] = None) -> OHLCData:
     """
@@ -58,15 +78,16 @@ def load_ohlc(path: str | Path, adapter: Optional[str] = None) -> OHLCData:
 
     # 如果指定了适配器
     if adapter is not None:
-        if adapter not in ADAPTERS:
-            logger.error(f"未知适配器: '{adapter}'，可用: {list(ADAPTERS.keys())}")
-            raise ValueError(f"未知适配器: '{adapter}'，可用: {list(ADAPTERS.keys())}")
-        selected_adapter = ADAPTERS[adapter]
+        selected_adapter = ADAPTERS.get(adapter)
+        if selected_adapter is None:
+            logger.error(f"未知适配器: '{adapter}'，可用: {list(ADAPTERS)}")
+            raise ValueError(f"未知适配器: '{adapter}'，可用: {list(ADAPTERS)}")
         logger.info(f"使用指定适配器: {selected_adapter.name}")
         return selected_adapter.load(path)
 
-    # 自动检测适配器
-    for name, adp in ADAPTERS.items():
+    # 自动检测适配器: 先按扩展名查找候选，未登记的扩展名回退到全部适配器
+    candidates = _extension_index().get(path.suffix.lower(), list(ADAPTERS.values()))
+    for adp in candidates:
         if adp.can_handle(path):
             logger.info(f"自动选择适配器: {adp.name}")
             data = adp.load(path)
@@ -79,7 +100,7 @@ def load_ohlc(path: str | Path, adapter: Optional[str] = None) -> OHLCData:
 
 def list_adapters() -> list[str]:
     """列出所有可用的适配器名称"""
-    return list(ADAPTERS.keys())
+    return list(ADAPTERS)
 
 
 def register_adapter(name: str, adapter: DataAdapter) -> None:
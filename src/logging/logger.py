@@ -2,18 +2,54 @@
 Logging configuration for the application.
 
 Provides centralized logging setup with support for console and file output.
+
+Log calls on hot paths should pass arguments lazily (``logger.debug("n=%d", n)``)
+or sit behind ``logger.isEnabledFor(...)`` so disabled levels cost nothing.
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
 # Global flag to track if logging has been configured
 _configured = False
 
+# Serializes configure/reset so concurrent callers cannot install handlers twice
+_config_lock = threading.Lock()
+
+# Background listener that owns the file handler when file logging is enabled
+_file_listener: Optional[QueueListener] = None
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders ``asctime`` once per second instead of once per record."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._time_cache: tuple[int, Optional[str], str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if not datefmt:
+            # Default format includes milliseconds, which cannot be cached per second
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, cached_fmt, cached_text = self._time_cache
+        if second == cached_second and datefmt == cached_fmt:
+            return cached_text
+
+        text = time.strftime(datefmt, self.converter(second))
+        self._time_cache = (second, datefmt, text)
+        return text
+
 
 def configure_logging(
     level: str = "INFO",
@@ -32,58 +68,71 @@ def configure_logging(
         log_dir: Directory for log files (used if log_file not specified)
         format_string: Custom log format string (optional)
 
+    File records are written by a background listener thread; ``reset_logging()``
+    (also run at exit) drains the queue and closes the file.
+
     Example:
         configure_logging(level="DEBUG", log_to_file=True)
     """
-    global _configured
+    global _configured, _file_listener
 
     if _configured:
         return
 
-    # Convert level string to logging constant
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
+    with _config_lock:
+        if _configured:
+            return
 
-    # Default format
-    if format_string is None:
-        format_string = "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s"
+        # Convert level string to logging constant
+        numeric_level = getattr(logging, level.upper(), logging.INFO)
 
-    # Date format
-    date_format = "%Y-%m-%d %H:%M:%S"
+        # Default format
+        if format_string is None:
+            format_string = "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s"
 
-    # Create formatter
-    formatter = logging.Formatter(format_string, datefmt=date_format)
+        # Date format
+        date_format = "%Y-%m-%d %H:%M:%S"
 
-    # Get root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(numeric_level)
+        # Create formatter
+        formatter = _CachedTimeFormatter(format_string, datefmt=date_format)
 
-    # Remove existing handlers
-    root_logger.handlers.clear()
+        # Get root logger
+        root_logger = logging.getLogger()
+        root_logger.setLevel(numeric_level)
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+        # Remove existing handlers
+        root_logger.handlers.clear()
 
-    # File handler (optional)
-    if log_to_file:
-        if log_file is None:
-            log_file = Path(log_dir) / "app.log"
-        else:
-            log_file = Path(log_file)
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(numeric_level)
+        console_handler.setFormatter(formatter)
+        root_logger.addHandler(console_handler)
 
-        # Create log directory if it doesn't exist
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        # File handler (optional)
+        if log_to_file:
+            if log_file is None:
+                log_file = Path(log_dir) / "app.log"
+            else:
+                log_file = Path(log_file)
 
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+            # Create log directory if it doesn't exist
+            log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        root_logger.info(f"Logging to file: {log_file}")
+            # File writes happen on a listener thread; callers only enqueue records
+            file_handler = logging.FileHandler(log_file, encoding="utf-8")
+            file_handler.setLevel(numeric_level)
+            file_handler.setFormatter(formatter)
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            _file_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _file_listener.start()
+            root_logger.addHandler(QueueHandler(log_queue))
+
+            root_logger.info(f"Logging to file: {log_file}")
+
+        _configured = True
 
-    _configured = True
     root_logger.debug(f"Logging configured at {level} level")
 
 
@@ -104,11 +153,32 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def _stop_file_listener() -> None:
+    """Drain queued file records, then close the file handler."""
+    global _file_listener
+    if _file_listener is None:
+        return
+
+    _file_listener.stop()
+    for handler in _file_listener.handlers:
+        handler.close()
+    _file_listener = None
+
+
+atexit.register(_stop_file_listener)
+
+
 def reset_logging() -> None:
     """Reset logging configuration (mainly for testing)."""
     global _configured
-    _configured = False
 
-    root_logger = logging.getLogger()
-    root_logger.handlers.clear()
-    root_logger.setLevel(logging.WARNING)
+    with _config_lock:
+        _configured = False
+
+        _stop_file_listener()
+
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers:
+            handler.close()
+        root_logger.handlers.clear()
+        root_logger.setLevel(logging.WARNING)
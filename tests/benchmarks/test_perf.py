@@ -0,0 +1,40 @@
+"""
+Benchmarks for bar feature extraction.
+
+Requires pytest-benchmark; the module is skipped when it is not installed.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.bar_features import compute_bar_features
+
+pytest.importorskip("pytest_benchmark")
+
+N_BARS = 1_000_000
+
+
+@pytest.fixture(scope="session")
+def big_ohlc() -> pd.DataFrame:
+    """Create a synthetic random-walk OHLC frame."""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, N_BARS))
+    open_price = close + rng.normal(0, 0.1, N_BARS)
+    return pd.DataFrame(
+        {
+            "open": open_price,
+            "high": np.maximum(open_price, close) + 0.5,
+            "low": np.minimum(open_price, close) - 0.5,
+            "close": close,
+        }
+    )
+
+
+def test_bench_compute_bar_features(benchmark, big_ohlc: pd.DataFrame) -> None:
+    """Benchmark compute_bar_features on one million bars."""
+    result = benchmark(compute_bar_features, big_ohlc)
+
+    assert len(result) == N_BARS
@@ -0,0 +1,223 @@
+"""
+Tests for bar features module.
+
+Tests single-bar shape features and Al Brooks cross-bar patterns.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.bar_features import (
+    add_bar_features,
+    compute_bar_features,
+    compute_bar_features_batch,
+)
+
+OHLC_COLUMNS = ("open", "high", "low", "close")
+
+
+def _ohlc_frame(rows: list[list[float]]) -> pd.DataFrame:
+    """Build a float64 OHLC frame from one [open, high, low, close] row per bar."""
+    return pd.DataFrame(np.array(rows, dtype=np.float64), columns=OHLC_COLUMNS)
+
+
+def _ohlc_columns(open_price, high, low, close) -> pd.DataFrame:
+    """Build a float64 OHLC frame from one sequence per column."""
+    columns = (open_price, high, low, close)
+    return pd.DataFrame(
+        {name: np.asarray(values, dtype=np.float64) for name, values in zip(OHLC_COLUMNS, columns)},
+        copy=False,
+    )
+
+
+@pytest.fixture(scope="module")
+def single_bar_features() -> pd.DataFrame:
+    """Compute features for all independent single-bar cases in one call.
+
+    Rows are labelled by case; only intra-bar features are asserted on them since
+    cross-bar columns see the neighbouring case as the previous bar.
+    """
+    df = _ohlc_columns(
+        [10.0, 14.0, 10.0, 10.0, 10.0, 10.0],
+        [15.0, 15.0, 15.0, 15.0, 15.0, 10.0],
+        [9.0, 9.0, 5.0, 10.0, 10.0, 10.0],
+        [14.0, 10.0, 10.5, 15.0, 12.5, 10.0],
+    ).set_axis(["bull", "bear", "doji", "close_high", "close_mid", "zero_range"])
+    return compute_bar_features(df)
+
+
+@pytest.fixture(scope="module")
+def bar_pair_features() -> pd.DataFrame:
+    """Compute features for all two-bar cases in one call.
+
+    Cases are stacked under a (case, bar) index. Cross-bar columns are asserted on
+    bar 1 of each case, whose previous bar is bar 0 of the same case.
+    """
+    pairs = {
+        "bull_engulfing": [[12.0, 13.0, 10.0, 11.0], [10.5, 14.0, 10.0, 13.5]],
+        "bear_engulfing": [[11.0, 13.0, 10.0, 12.0], [13.5, 14.0, 10.0, 10.5]],
+        "open_at_close": [[10.0, 12.5, 9.5, 12.0], [12.0, 13.0, 11.0, 12.5]],
+        "gap_open": [[10.0, 12.5, 9.5, 12.0], [13.0, 14.0, 12.5, 13.5]],
+    }
+    df = pd.concat({case: _ohlc_frame(rows) for case, rows in pairs.items()}, names=["case", "bar"])
+    return compute_bar_features(df)
+
+
+@pytest.fixture(scope="module")
+def bar_frames() -> dict[str, pd.DataFrame]:
+    """Create multi-bar OHLC frames once and share them across the module."""
+    # 20 unit-range bull bars followed by one bar five times as wide
+    climax_open = np.arange(21, dtype=np.float64)
+    climax_high = climax_open + 1.0
+    climax_high[20] = 25.0
+    climax_close = climax_open + 1.0
+    climax_close[20] = 22.0
+
+    return {
+        "bull": _ohlc_frame([[10.0, 15.0, 9.0, 14.0]]),
+        "climax": _ohlc_columns(climax_open, climax_high, climax_open, climax_close),
+        "streak": _ohlc_frame(
+            [
+                [0.0, 10.0, 0.0, 7.0],
+                [0.0, 10.0, 0.0, 8.0],
+                [0.0, 10.0, 0.0, 2.0],
+                [10.0, 10.0, 0.0, 3.0],
+                [10.0, 10.0, 0.0, 2.0],
+                [0.0, 10.0, 0.0, 9.0],
+            ]
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "case, color, body_pct, is_trend_bar, is_doji",
+    [
+        ("bull", 1, 4 / 6, True, False),
+        ("bear", -1, 4 / 6, True, False),
+        ("doji", 1, 0.05, False, True),
+    ],
+)
+def test_compute_bar_features_bar_shape(
+    single_bar_features: pd.DataFrame,
+    case: str,
+    color: int,
+    body_pct: float,
+    is_trend_bar: bool,
+    is_doji: bool,
+) -> None:
+    """Test color, body and classification of bull, bear and doji bars."""
+    row = single_bar_features.loc[case]
+    total_pct = row["body_pct"] + row["upper_tail_pct"] + row["lower_tail_pct"]
+
+    assert row["bar_color"] == color
+    assert row["body_pct"] == pytest.approx(body_pct, abs=1e-3)
+    assert row["signed_body"] == pytest.approx(color * body_pct, abs=1e-3)
+    assert total_pct == pytest.approx(1.0, abs=1e-3)
+    assert row["is_trend_bar"] == is_trend_bar
+    assert row["is_trading_range_bar"] != is_trend_bar
+    assert row["is_doji"] == is_doji
+
+
+def test_compute_bar_features_scale(single_bar_features: pd.DataFrame) -> None:
+    """Test range, body and tail sizes of a standard bull bar."""
+    result = single_bar_features
+
+    assert result.at["bull", "total_range"] == 6.0
+    assert result.at["bull", "body_size"] == 4.0
+    assert result.at["bull", "upper_tail_pct"] == pytest.approx(1 / 6, abs=1e-3)
+    assert result.at["bull", "lower_tail_pct"] == pytest.approx(1 / 6, abs=1e-3)
+
+
+def test_compute_bar_features_close_on_extreme(single_bar_features: pd.DataFrame) -> None:
+    """Test close_on_extreme for a close at the high and at the midpoint."""
+    result = single_bar_features
+
+    assert result.at["close_high", "close_on_extreme"]
+    assert result.at["close_high", "clv"] == pytest.approx(1.0, abs=1e-3)
+    assert not result.at["close_mid", "close_on_extreme"]
+    assert result.at["close_mid", "clv"] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_compute_bar_features_zero_range_bar(single_bar_features: pd.DataFrame) -> None:
+    """Test that a zero-range bar yields NaN ratios instead of raising."""
+    result = single_bar_features
+
+    assert result.at["zero_range", "bar_color"] == 0
+    assert np.isnan(result.at["zero_range", "body_pct"])
+    assert np.isnan(result.at["zero_range", "clv"])
+
+
+def test_compute_bar_features_rel_range_and_climax(bar_frames: dict[str, pd.DataFrame]) -> None:
+    """Test that a bar far wider than the 20-bar average is a climax bar."""
+    result = compute_bar_features(bar_frames["climax"])
+
+    assert result["rel_range_to_avg"].dtype == np.float64
+    assert result["body_pct"].dtype == np.float64
+
+    rel_range = result["rel_range_to_avg"].to_numpy()
+    is_climax = result["is_climax_bar"].to_numpy()
+
+    assert np.isnan(rel_range[18])
+    assert rel_range[19] == pytest.approx(1.0, abs=1e-3)
+    assert not is_climax[19]
+    assert rel_range[20] == pytest.approx(5 / 1.2, abs=1e-3)
+    assert is_climax[20]
+
+
+def test_compute_bar_features_trend_streak(bar_frames: dict[str, pd.DataFrame]) -> None:
+    """Test that trend streak counts same-direction trend bars and resets otherwise."""
+    result = compute_bar_features(bar_frames["streak"])
+
+    expected_trend = np.array([True, True, False, True, True, True])
+    expected_streak = np.array([1, 2, 0, 1, 2, 1], dtype=np.int64)
+
+    assert result["bar_color"].dtype == np.int8
+    assert np.array_equal(result["is_trend_bar"].to_numpy(), expected_trend)
+    assert np.array_equal(result["trend_streak"].to_numpy(), expected_streak)
+
+
+def test_compute_bar_features_engulfing(bar_pair_features: pd.DataFrame) -> None:
+    """Test bull and bear engulfing detection against the previous body."""
+    second_bar = bar_pair_features.xs(1, level="bar")
+
+    assert second_bar.at["bull_engulfing", "is_bull_engulfing"]
+    assert not second_bar.at["bull_engulfing", "is_bear_engulfing"]
+    assert second_bar.at["bear_engulfing", "is_bear_engulfing"]
+    assert not second_bar.at["bear_engulfing", "is_bull_engulfing"]
+    # The first bar of the frame has no previous body to engulf
+    assert not bar_pair_features["is_bull_engulfing"].iat[0]
+
+
+def test_compute_bar_features_open_in_body(bar_pair_features: pd.DataFrame) -> None:
+    """Test open_in_body for an open at the prior close and a gap open."""
+    second_bar = bar_pair_features.xs(1, level="bar")
+
+    assert second_bar.at["open_at_close", "open_in_body"]
+    assert not second_bar.at["gap_open", "open_in_body"]
+    assert second_bar.at["gap_open", "gap_type"] == 1
+
+
+def test_add_bar_features_prefix(bar_frames: dict[str, pd.DataFrame]) -> None:
+    """Test that add_bar_features appends prefixed columns without mutating input."""
+    df = bar_frames["bull"]
+
+    result = add_bar_features(df, prefix="bf_")
+
+    assert "bf_body_pct" in result.columns
+    assert "bf_bar_color" in result.columns
+    assert tuple(df.columns) == OHLC_COLUMNS
+    assert len(result) == len(df)
+
+
+def test_compute_bar_features_batch_matches_single(bar_frames: dict[str, pd.DataFrame]) -> None:
+    """Test that batched computation returns per-frame results in input order."""
+    frames = [bar_frames["climax"], bar_frames["streak"], bar_frames["bull"]]
+
+    results = compute_bar_features_batch(frames, max_workers=2)
+
+    assert len(results) == len(frames)
+    for df, result in zip(frames, results):
+        pd.testing.assert_frame_equal(result, compute_bar_features(df))
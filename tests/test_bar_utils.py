@@ -8,7 +8,6 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
-import pytest
 
 from src.analysis._bar_utils import (
     calculate_blend_candle,
@@ -17,6 +16,7 @@ from src.analysis._bar_utils import (
     calculate_engulfing,
     calculate_failed_breakouts,
     calculate_tails,
+    rolling_mean,
     safe_divide_array,
 )
 
@@ -44,6 +44,17 @@ def test_safe_divide_array_with_zeros() -> None:
     assert result[2] == 6.0
 
 
+def test_rolling_mean_matches_pandas() -> None:
+    """Test rolling mean against pandas, including NaN warm-up and NaN inputs."""
+    values = np.array([1.0, 2.0, 4.0, np.nan, 3.0, 5.0, 6.0, 2.0])
+
+    result = rolling_mean(values, 3)
+
+    expected = pd.Series(values).rolling(window=3).mean().to_numpy()
+    np.testing.assert_allclose(result, expected)
+    assert np.isnan(rolling_mean(values[:2], 3)).all()
+
+
 def test_calculate_tails_bull_bar() -> None:
     """Test tail calculation for bull bar."""
     high = np.array([110])
@@ -92,51 +103,52 @@ def test_calculate_blend_candle() -> None:
 
 def test_calculate_consecutive_streak() -> None:
     """Test consecutive trend bar streak calculation."""
-    df = pd.DataFrame({"close": [100, 101, 102, 103, 102, 101, 102, 103, 104]})
-
     is_trend_bar = pd.Series([True, True, True, True, False, True, True, True, True])
     bar_color = pd.Series([1, 1, 1, 1, -1, -1, 1, 1, 1])
 
-    result = calculate_consecutive_streak(is_trend_bar, bar_color, df)
+    result = calculate_consecutive_streak(is_trend_bar, bar_color)
 
     # First 4 bars: consecutive bull trend
     assert result[0] == 1
     assert result[1] == 2
     assert result[2] == 3
     assert result[3] == 4
+    # Non-trend bar resets; a color change starts a new streak
+    np.testing.assert_array_equal(result[4:], [0, 1, 1, 2, 3])
 
 
 def test_calculate_engulfing_bull() -> None:
     """Test bull engulfing pattern detection."""
-    bar_color = pd.Series([1, -1, 1, 1])
-    prev_body_bottom = pd.Series([100, 102, 98, 104]).shift(1)
-    curr_body_bottom = pd.Series([100, 102, 98, 104])
-    prev_body_top = pd.Series([105, 104, 106, 108]).shift(1)
-    curr_body_top = pd.Series([105, 104, 106, 108])
+    bar_color = np.array([1, -1, 1, 1])
+    prev_body_bottom = np.array([np.nan, 100, 102, 98])
+    curr_body_bottom = np.array([100, 102, 98, 104])
+    prev_body_top = np.array([np.nan, 105, 104, 106])
+    curr_body_top = np.array([105, 104, 106, 108])
 
     is_bull, is_bear = calculate_engulfing(
         bar_color, prev_body_bottom, curr_body_bottom, prev_body_top, curr_body_top
     )
 
-    # Check that we got boolean arrays back
-    assert isinstance(is_bull, pd.Series)
-    assert isinstance(is_bear, pd.Series)
+    # Bar 2 reverses the previous bar's color and its body covers the previous body
+    np.testing.assert_array_equal(is_bull, [False, False, True, False])
+    np.testing.assert_array_equal(is_bear, [False, False, False, False])
 
 
 def test_calculate_engulfing_bear() -> None:
     """Test bear engulfing pattern detection."""
-    bar_color = pd.Series([-1, 1, -1, -1])
-    prev_body_bottom = pd.Series([100, 102, 98, 104]).shift(1)
-    curr_body_bottom = pd.Series([100, 102, 98, 104])
-    prev_body_top = pd.Series([105, 104, 106, 108]).shift(1)
-    curr_body_top = pd.Series([105, 104, 106, 108])
+    bar_color = np.array([-1, 1, -1, -1])
+    prev_body_bottom = np.array([np.nan, 100, 102, 98])
+    curr_body_bottom = np.array([100, 102, 98, 104])
+    prev_body_top = np.array([np.nan, 105, 104, 106])
+    curr_body_top = np.array([105, 104, 106, 108])
 
     is_bull, is_bear = calculate_engulfing(
         bar_color, prev_body_bottom, curr_body_bottom, prev_body_top, curr_body_top
     )
 
-    assert isinstance(is_bull, pd.Series)
-    assert isinstance(is_bear, pd.Series)
+    # Bar 2 reverses the previous bar's color and its body covers the previous body
+    np.testing.assert_array_equal(is_bull, [False, False, False, False])
+    np.testing.assert_array_equal(is_bear, [False, False, True, False])
 
 
 def test_calculate_failed_breakouts_high() -> None:
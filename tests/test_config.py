@@ -6,6 +6,7 @@ Tests Pydantic configuration models and YAML loading.
 
 from __future__ import annotations
 
+import os
 import tempfile
 from pathlib import Path
 
@@ -146,6 +147,29 @@ log_level: "WARNING"
         temp_path.unlink()
 
 
+def test_app_config_from_yaml_or_default_cached_copy() -> None:
+    """Test cached loads return independent copies and reload on file change."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write("log_level: WARNING\n")
+        temp_path = Path(f.name)
+
+    try:
+        first = AppConfig.from_yaml_or_default(temp_path)
+        first.log_level = "DEBUG"
+
+        second = AppConfig.from_yaml_or_default(temp_path)
+        assert second.log_level == "WARNING"
+
+        temp_path.write_text("log_level: ERROR\n")
+        stat = temp_path.stat()
+        os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        third = AppConfig.from_yaml_or_default(temp_path)
+        assert third.log_level == "ERROR"
+    finally:
+        temp_path.unlink()
+
+
 def test_app_config_from_yaml_or_default_no_file() -> None:
     """Test from_yaml_or_default falls back to defaults."""
     config = AppConfig.from_yaml_or_default("definitely_nonexistent.yaml")
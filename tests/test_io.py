@@ -14,6 +14,8 @@ import pytest
 
 from src.io import list_adapters, load_ohlc
 from src.io.adapters import StandardAdapter, WindCFEAdapter
+from src.io.adapters.base import DataAdapter
+from src.io.file_discovery import scan_data_files
 from src.io.loader import ADAPTERS
 from src.io.schema import OHLCData
 
@@ -182,8 +184,8 @@ def test_ohlc_data_schema() -> None:
     assert data.symbol == "TEST"
     assert data.name == "Test Data"
     assert len(data.df) == 3
-    assert data.date_range[0] == df["datetime"].iloc[0]
-    assert data.date_range[1] == df["datetime"].iloc[-1]
+    assert data.date_range[0] == df["datetime"].iat[0]
+    assert data.date_range[1] == df["datetime"].iat[-1]
 
 
 def test_standard_adapter_load_validates_columns(temp_csv_file: Path) -> None:
@@ -227,6 +229,47 @@ def test_adapters_registry() -> None:
     assert isinstance(ADAPTERS["wind_cfe"], WindCFEAdapter)
 
 
+class _CSVProbeAdapter(DataAdapter):
+    """CSV adapter that accepts any .csv file and records what it was asked to load."""
+
+    name = "CSV Probe"
+    supported_extensions = [".csv"]
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self.loaded: list[Path] = []
+
+    def load(self, path: str | Path) -> OHLCData:
+        self.loaded.append(Path(path))
+        return OHLCData(df=self.df, symbol="PROBE", name="Probe")
+
+
+def test_load_ohlc_probes_adapter_added_to_registry(
+    sample_ohlc_df: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that adapters added to or removed from ADAPTERS directly are seen by load_ohlc."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        pd.DataFrame({"foo": [1, 2], "bar": [3, 4]}).to_csv(f.name, index=False)
+        temp_path = Path(f.name)
+
+    try:
+        # WindCFEAdapter takes any .csv and rejects these columns; this also builds the index
+        with pytest.raises(ValueError):
+            load_ohlc(temp_path)
+
+        probe = _CSVProbeAdapter(sample_ohlc_df)
+        monkeypatch.delitem(ADAPTERS, "wind_cfe")
+        monkeypatch.setitem(ADAPTERS, "csv_probe", probe)
+
+        data = load_ohlc(temp_path)
+
+        assert data.symbol == "PROBE"
+        assert probe.loaded == [temp_path]
+        assert list_adapters() == ["standard", "csv_probe"]
+    finally:
+        temp_path.unlink()
+
+
 def test_standard_adapter_name() -> None:
     """Test StandardAdapter has correct name."""
     adapter = StandardAdapter()
@@ -237,3 +280,15 @@ def test_wind_cfe_adapter_name() -> None:
     """Test WindCFEAdapter has correct name."""
     adapter = WindCFEAdapter()
     assert adapter.name == "Wind CFE"
+
+
+def test_scan_data_files_matches_extensions_case_insensitively(tmp_path: Path) -> None:
+    """Test that upper-case extensions are listed and directories named *.csv are not."""
+    (tmp_path / "b.CSV").write_text("abc")
+    (tmp_path / "A.XLSX").write_bytes(b"12345")
+    (tmp_path / "notes.txt").write_text("skip")
+    (tmp_path / "archive.csv").mkdir()
+
+    result = scan_data_files(tmp_path)
+
+    assert result == [(tmp_path / "A.XLSX", 5), (tmp_path / "b.CSV", 3)]
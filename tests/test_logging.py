@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import logging
 import tempfile
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -15,9 +17,16 @@ import pytest
 from src.logging import configure_logging, get_logger, reset_logging
 
 
+@pytest.fixture(autouse=True)
+def clean_logging() -> Iterator[None]:
+    """Start each test unconfigured and drop its handlers afterwards."""
+    reset_logging()
+    yield
+    reset_logging()
+
+
 def test_configure_logging_basic() -> None:
     """Test basic logging configuration."""
-    reset_logging()
     configure_logging(level="DEBUG")
 
     logger = get_logger(__name__)
@@ -29,8 +38,6 @@ def test_configure_logging_basic() -> None:
 
 def test_configure_logging_with_file() -> None:
     """Test logging configuration with file output."""
-    reset_logging()
-
     with tempfile.TemporaryDirectory() as tmpdir:
         log_file = Path(tmpdir) / "test.log"
 
@@ -39,6 +46,9 @@ def test_configure_logging_with_file() -> None:
         logger = get_logger(__name__)
         logger.info("Test message")
 
+        # File records are written by a background listener; reset drains it
+        reset_logging()
+
         # File should be created
         assert log_file.exists()
 
@@ -68,8 +78,6 @@ def test_get_logger_returns_logger() -> None:
 
 def test_configure_logging_only_once() -> None:
     """Test that configure_logging only runs once."""
-    reset_logging()
-
     configure_logging(level="DEBUG")
     root_logger = logging.getLogger()
     handler_count = len(root_logger.handlers)
@@ -79,10 +87,20 @@ def test_configure_logging_only_once() -> None:
     assert len(root_logger.handlers) == handler_count
 
 
+def test_configure_logging_concurrent_calls() -> None:
+    """Test that concurrent configure_logging calls install handlers once."""
+    threads = [threading.Thread(target=configure_logging, args=("INFO",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stdout_handlers = [h for h in logging.getLogger().handlers if type(h) is logging.StreamHandler]
+    assert len(stdout_handlers) == 1
+
+
 def test_configure_logging_custom_format() -> None:
     """Test logging with custom format string."""
-    reset_logging()
-
     custom_format = "%(levelname)s - %(message)s"
     configure_logging(level="INFO", format_string=custom_format)
 
@@ -93,8 +111,6 @@ def test_configure_logging_custom_format() -> None:
 
 def test_logging_to_directory_creation() -> None:
     """Test that log directory is created if it doesn't exist."""
-    reset_logging()
-
     with tempfile.TemporaryDirectory() as tmpdir:
         log_dir = Path(tmpdir) / "logs" / "nested"
         log_file = log_dir / "test.log"
@@ -103,6 +119,7 @@ def test_logging_to_directory_creation() -> None:
 
         logger = get_logger(__name__)
         logger.info("Test")
+        reset_logging()
 
         assert log_dir.exists()
         assert log_file.exists()
@@ -110,7 +127,6 @@ def test_logging_to_directory_creation() -> None:
 
 def test_reset_logging() -> None:
     """Test reset_logging clears handlers."""
-    reset_logging()
     configure_logging(level="INFO")
 
     root_logger = logging.getLogger()
@@ -118,3 +134,16 @@ def test_reset_logging() -> None:
 
     reset_logging()
     assert len(root_logger.handlers) == 0
+
+
+def test_configure_logging_timestamp_format() -> None:
+    """Test cached timestamps match the standard formatter output."""
+    configure_logging(level="INFO")
+
+    formatter = logging.getLogger().handlers[0].formatter
+    reference = logging.Formatter(datefmt="%Y-%m-%d %H:%M:%S")
+    for created in (1_700_000_000.1, 1_700_000_000.9, 1_700_000_001.2):
+        record = logging.makeLogRecord({"msg": "x", "created": created})
+        assert formatter.formatTime(record, formatter.datefmt) == reference.formatTime(
+            record, reference.datefmt
+        )
@@ -17,7 +17,7 @@ from src.analysis.reversals import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_ohlc() -> pd.DataFrame:
     """Create sample OHLC data for testing."""
     return pd.DataFrame(
@@ -30,7 +30,7 @@ def sample_ohlc() -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def v_top_data() -> pd.DataFrame:
     """Create data with V-Top pattern (bull climax followed by bear reversal)."""
     return pd.DataFrame(
@@ -43,7 +43,7 @@ def v_top_data() -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def v_bottom_data() -> pd.DataFrame:
     """Create data with V-Bottom pattern (bear climax followed by bull reversal)."""
     return pd.DataFrame(
@@ -56,7 +56,7 @@ def v_bottom_data() -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def consecutive_bear_data() -> pd.DataFrame:
     """Create data with consecutive bear bars."""
     return pd.DataFrame(
@@ -69,7 +69,7 @@ def consecutive_bear_data() -> pd.DataFrame:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def consecutive_bull_data() -> pd.DataFrame:
     """Create data with consecutive bull bars."""
     return pd.DataFrame(
@@ -82,6 +82,19 @@ def consecutive_bull_data() -> pd.DataFrame:
     )
 
 
+@pytest.fixture(scope="module")
+def structure_data() -> pd.DataFrame:
+    """Create four bars with major swing levels for structure merging."""
+    return pd.DataFrame(
+        {
+            "high": [100, 105, 110, 108],
+            "low": [95, 100, 105, 103],
+            "major_high": [100, 105, 110, 110],
+            "major_low": [95, 95, 95, 95],
+        }
+    )
+
+
 def test_detect_climax_reversal_returns_required_columns(sample_ohlc: pd.DataFrame) -> None:
     """Test that detect_climax_reversal returns required columns."""
     result = detect_climax_reversal(sample_ohlc)
@@ -103,18 +116,12 @@ def test_detect_climax_reversal_preserves_original_data(sample_ohlc: pd.DataFram
     assert "close" in result.columns
 
 
-def test_detect_climax_reversal_v_top(v_top_data: pd.DataFrame) -> None:
-    """Test V-Top reversal detection."""
-    result = detect_climax_reversal(v_top_data, atr_multiplier=1.5)
-
-    # With the pattern structure, might or might not detect - test columns exist
-    assert "is_climax_top" in result.columns
-    assert "is_climax_bottom" in result.columns
-
-
-def test_detect_climax_reversal_v_bottom(v_bottom_data: pd.DataFrame) -> None:
-    """Test V-Bottom reversal detection."""
-    result = detect_climax_reversal(v_bottom_data, atr_multiplier=1.5)
+@pytest.mark.parametrize("data_fixture", ["v_top_data", "v_bottom_data"])
+def test_detect_climax_reversal_v_pattern(
+    request: pytest.FixtureRequest, data_fixture: str
+) -> None:
+    """Test V-Top and V-Bottom reversal detection."""
+    result = detect_climax_reversal(request.getfixturevalue(data_fixture), atr_multiplier=1.5)
 
     # With the pattern structure, might or might not detect - test columns exist
     assert "is_climax_top" in result.columns
@@ -149,8 +156,8 @@ def test_detect_climax_reversal_single_bar() -> None:
 
     result = detect_climax_reversal(df)
     assert len(result) == 1
-    assert not result["is_climax_top"].iloc[0]
-    assert not result["is_climax_bottom"].iloc[0]
+    assert not result["is_climax_top"].iat[0]
+    assert not result["is_climax_bottom"].iat[0]
 
 
 def test_detect_consecutive_reversal_returns_required_columns(sample_ohlc: pd.DataFrame) -> None:
@@ -163,22 +170,22 @@ def test_detect_consecutive_reversal_returns_required_columns(sample_ohlc: pd.Da
     assert "consecutive_bottom_price" in result.columns
 
 
-def test_detect_consecutive_reversal_bear_pattern(consecutive_bear_data: pd.DataFrame) -> None:
-    """Test consecutive bear reversal detection."""
-    result = detect_consecutive_reversal(consecutive_bear_data, consecutive_count=3)
+@pytest.mark.parametrize(
+    "data_fixture, start_col, price_col",
+    [
+        ("consecutive_bear_data", "consecutive_bear_start", "consecutive_top_price"),
+        ("consecutive_bull_data", "consecutive_bull_start", "consecutive_bottom_price"),
+    ],
+)
+def test_detect_consecutive_reversal_pattern(
+    request: pytest.FixtureRequest, data_fixture: str, start_col: str, price_col: str
+) -> None:
+    """Test consecutive bear and bull reversal detection."""
+    result = detect_consecutive_reversal(request.getfixturevalue(data_fixture), consecutive_count=3)
 
     # Check that columns exist and function runs without error
-    assert "consecutive_bear_start" in result.columns
-    assert "consecutive_top_price" in result.columns
-
-
-def test_detect_consecutive_reversal_bull_pattern(consecutive_bull_data: pd.DataFrame) -> None:
-    """Test consecutive bull reversal detection."""
-    result = detect_consecutive_reversal(consecutive_bull_data, consecutive_count=3)
-
-    # Check that columns exist and function runs without error
-    assert "consecutive_bull_start" in result.columns
-    assert "consecutive_bottom_price" in result.columns
+    assert start_col in result.columns
+    assert price_col in result.columns
 
 
 def test_detect_consecutive_reversal_custom_threshold() -> None:
@@ -214,35 +221,17 @@ def test_detect_consecutive_reversal_empty_dataframe() -> None:
     assert len(result) == 0
 
 
-def test_merge_structure_with_events_basic() -> None:
+def test_merge_structure_with_events_basic(structure_data: pd.DataFrame) -> None:
     """Test merging structure with events."""
-    df = pd.DataFrame(
-        {
-            "high": [100, 105, 110, 108],
-            "low": [95, 100, 105, 103],
-            "major_high": [100, 105, 110, 110],
-            "major_low": [95, 95, 95, 95],
-        }
-    )
-
-    result = merge_structure_with_events(df)
+    result = merge_structure_with_events(structure_data)
 
     assert "adjusted_major_high" in result.columns
     assert "adjusted_major_low" in result.columns
-    assert len(result) == len(df)
+    assert len(result) == len(structure_data)
 
 
-def test_merge_structure_with_climax_events() -> None:
+def test_merge_structure_with_climax_events(structure_data: pd.DataFrame) -> None:
     """Test merging with climax reversal events."""
-    df = pd.DataFrame(
-        {
-            "high": [100, 105, 110, 108],
-            "low": [95, 100, 105, 103],
-            "major_high": [100, 105, 110, 110],
-            "major_low": [95, 95, 95, 95],
-        }
-    )
-
     df_climax = pd.DataFrame(
         {
             "is_climax_top": [False, False, True, False],
@@ -252,23 +241,14 @@ def test_merge_structure_with_climax_events() -> None:
         }
     )
 
-    result = merge_structure_with_events(df, df_events_climax=df_climax)
+    result = merge_structure_with_events(structure_data, df_events_climax=df_climax)
 
     assert "adjusted_major_high" in result.columns
     assert "override_high_price" in result.columns
 
 
-def test_merge_structure_with_consecutive_events() -> None:
+def test_merge_structure_with_consecutive_events(structure_data: pd.DataFrame) -> None:
     """Test merging with consecutive reversal events."""
-    df = pd.DataFrame(
-        {
-            "high": [100, 105, 110, 108],
-            "low": [95, 100, 105, 103],
-            "major_high": [100, 105, 110, 110],
-            "major_low": [95, 95, 95, 95],
-        }
-    )
-
     df_consecutive = pd.DataFrame(
         {
             "consecutive_bear_start": [False, False, True, False],
@@ -278,28 +258,21 @@ def test_merge_structure_with_consecutive_events() -> None:
         }
     )
 
-    result = merge_structure_with_events(df, df_events_consecutive=df_consecutive)
+    result = merge_structure_with_events(structure_data, df_events_consecutive=df_consecutive)
 
     assert "adjusted_major_high" in result.columns
     assert "override_high_price" in result.columns
 
 
-def test_merge_structure_no_events() -> None:
+def test_merge_structure_no_events(structure_data: pd.DataFrame) -> None:
     """Test merge when no reversal events provided."""
-    df = pd.DataFrame(
-        {
-            "high": [100, 105, 110, 108],
-            "low": [95, 100, 105, 103],
-            "major_high": [100, 105, 110, 110],
-            "major_low": [95, 95, 95, 95],
-        }
+    result = merge_structure_with_events(
+        structure_data, df_events_climax=None, df_events_consecutive=None
     )
 
-    result = merge_structure_with_events(df, df_events_climax=None, df_events_consecutive=None)
-
     # Without events, adjusted should match original
     pd.testing.assert_series_equal(
-        result["adjusted_major_high"].fillna(-1), result["major_high"].fillna(-1), check_names=False
+        result["adjusted_major_high"], result["major_high"], check_names=False
     )
 
 
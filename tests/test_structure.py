@@ -0,0 +1,257 @@
+"""
+Tests for swing detection and classification.
+
+Tests detect_swings and the classify_swings variants on small hand-built frames.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis._structure_utils import SWING_TYPES
+from src.analysis.swings import (
+    classify_swings,
+    classify_swings_v2,
+    classify_swings_v3,
+    detect_swings,
+)
+
+NAN = np.nan
+
+# Labels of the window=1 zigzag, one per bar; None where no swing is confirmed
+ZIGZAG_SWING_TYPES = [None, None, "LL", "HH", "LL", "HH", "LL", "DT", "DB", "LH", "HL", "HH"]
+
+
+@pytest.fixture(scope="module")
+def zigzag_ohlc() -> pd.DataFrame:
+    """Create a one-bar zigzag with a leading NaN bar.
+
+    The 110 -> 110.05 highs and 88 -> 88.05 lows fall inside the 0.1%
+    tolerance, so the sequence covers every swing label.
+    """
+    return pd.DataFrame(
+        {
+            "high": [NAN, 100, 105, 101, 110, 102, 110.05, 103, 108, 101, 109, 104],
+            "low": [NAN, 95, 99, 90, 97, 88, 97, 88.05, 96, 92, 100, 94],
+            "close": [NAN, 98, 104, 92, 108, 90, 109, 89, 107, 93, 108, 95],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def zigzag_swings(zigzag_ohlc: pd.DataFrame) -> pd.DataFrame:
+    """Detect window=1 swings on the zigzag frame."""
+    return detect_swings(zigzag_ohlc, window=1)
+
+
+def _swing_labels(result: pd.DataFrame) -> list[str | None]:
+    """Return swing_type as a list with None for missing labels."""
+    return [None if pd.isna(label) else label for label in result["swing_type"]]
+
+
+def test_detect_swings_keeps_float64_precision() -> None:
+    """Test that nearly equal highs are not merged into a tie by the extremum scan."""
+    highs = np.array([1, 2, 3, 4, 5, 65432.124, 65432.125, 7, 6, 5, 4, 3], dtype=np.float64)
+    df = pd.DataFrame({"high": highs, "low": highs - 1.0})
+
+    result = detect_swings(df, window=2)
+
+    # The swing high is bar 6, confirmed two bars later at bar 8
+    assert np.flatnonzero(result["swing_high_confirmed"].to_numpy()).tolist() == [8]
+    assert result["swing_high_price"].iat[8] == 65432.125
+
+
+def test_detect_swings_zigzag(zigzag_swings: pd.DataFrame) -> None:
+    """Test confirmation lag, swing prices and plot columns after a leading NaN bar."""
+    result = zigzag_swings
+
+    assert np.flatnonzero(result["swing_high_confirmed"].to_numpy()).tolist() == [3, 5, 7, 9, 11]
+    assert np.flatnonzero(result["swing_low_confirmed"].to_numpy()).tolist() == [2, 4, 6, 8, 10]
+    np.testing.assert_array_equal(
+        result["swing_high_price"],
+        [NAN, NAN, NAN, 105, NAN, 110, NAN, 110.05, NAN, 108, NAN, 109],
+    )
+    np.testing.assert_array_equal(
+        result["swing_low_price"],
+        [NAN, NAN, 95, NAN, 90, NAN, 88, NAN, 88.05, NAN, 92, NAN],
+    )
+    # Plot columns mark the pivot bar itself, one bar before confirmation
+    np.testing.assert_array_equal(
+        result["plot_swing_high"],
+        [NAN, NAN, 105, NAN, 110, NAN, 110.05, NAN, 108, NAN, 109, NAN],
+    )
+    np.testing.assert_array_equal(
+        result["plot_swing_low"],
+        [NAN, 95, NAN, 90, NAN, 88, NAN, 88.05, NAN, 92, NAN, NAN],
+    )
+
+
+def test_detect_swings_plateau_keeps_first_bar() -> None:
+    """Test that a flat top or bottom yields a single swing at its first bar."""
+    df = pd.DataFrame(
+        {
+            "high": [1.0, 3.0, 5.0, 5.0, 2.0, 1.0, 2.0, 3.0],
+            "low": [0.0, 2.0, 4.0, 4.0, 1.0, 0.0, 0.0, 2.0],
+        }
+    )
+
+    result = detect_swings(df, window=1)
+
+    assert np.flatnonzero(result["swing_high_confirmed"].to_numpy()).tolist() == [3]
+    assert result["swing_high_price"].iat[3] == 5.0
+    assert np.flatnonzero(result["swing_low_confirmed"].to_numpy()).tolist() == [1, 6]
+    assert result["swing_low_price"].iat[6] == 0.0
+    assert np.flatnonzero(result["plot_swing_low"].notna().to_numpy()).tolist() == [0, 5]
+
+
+def test_detect_swings_copy_false_mutates_input(zigzag_ohlc: pd.DataFrame) -> None:
+    """Test that copy=False writes the swing columns into the given frame."""
+    df = zigzag_ohlc.copy()
+
+    result = detect_swings(df, window=1, copy=False)
+
+    assert result is df
+    assert "swing_high_confirmed" in df.columns
+    assert "swing_high_confirmed" not in zigzag_ohlc.columns
+
+
+@pytest.mark.parametrize("classify", [classify_swings, classify_swings_v2, classify_swings_v3])
+def test_classify_swings_type_is_categorical(
+    zigzag_swings: pd.DataFrame, classify: Callable[..., pd.DataFrame]
+) -> None:
+    """Test that swing_type uses the fixed SWING_TYPES categories in order."""
+    result = classify(zigzag_swings)
+
+    dtype = result["swing_type"].dtype
+    assert isinstance(dtype, pd.CategoricalDtype)
+    assert list(dtype.categories) == list(SWING_TYPES)
+    assert not dtype.ordered
+
+
+def test_classify_swings_v1_zigzag(zigzag_swings: pd.DataFrame) -> None:
+    """Test labels and forward-filled major levels for the v1 classifier."""
+    result = classify_swings(zigzag_swings)
+
+    assert _swing_labels(result) == ZIGZAG_SWING_TYPES
+    np.testing.assert_array_equal(
+        result["major_high"],
+        [NAN, NAN, NAN, 105, 105, 110, 110, 110.05, 110.05, 108, 108, 109],
+    )
+    np.testing.assert_array_equal(
+        result["major_low"],
+        [NAN, NAN, 95, 95, 90, 90, 88, 88, 88.05, 88.05, 92, 92],
+    )
+
+
+def test_classify_swings_v2_zigzag(zigzag_swings: pd.DataFrame) -> None:
+    """Test labels, major levels and trend bias for the v2 classifier."""
+    result = classify_swings_v2(zigzag_swings)
+
+    assert _swing_labels(result) == ZIGZAG_SWING_TYPES
+    np.testing.assert_array_equal(
+        result["major_high"],
+        [NAN, NAN, 100, 105, 105, 110, 110, 110.05, 110.05, 110.05, 110.05, 110.05],
+    )
+    np.testing.assert_array_equal(
+        result["major_low"],
+        [NAN, NAN, 95, 95, 90, 90, 88, 88, 88, 88, 88, 88],
+    )
+    assert result["trend_bias"].tolist() == [0, 0, -1, 1, -1, 1, -1, 1, 1, 1, 1, 1]
+
+
+def test_classify_swings_v3_zigzag(zigzag_ohlc: pd.DataFrame) -> None:
+    """Test labels, major levels and market trend for the v3 classifier."""
+    df = zigzag_ohlc.iloc[1:].reset_index(drop=True)
+
+    result = classify_swings_v3(detect_swings(df, window=1), window=1)
+
+    assert _swing_labels(result) == ZIGZAG_SWING_TYPES[1:]
+    np.testing.assert_array_equal(
+        result["major_high"],
+        [100, 100, 105, 105, 105, 105, 105, 105, 105, 105, 105],
+    )
+    np.testing.assert_array_equal(
+        result["major_low"],
+        [95, 95, 95, 90, 90, 88, 88, 88.05, 88.05, 92, 92],
+    )
+    assert result["market_trend"].tolist() == [0, 1, -1, 1, 1, 1, 1, 1, 1, 1, 1]
+
+
+def test_classify_swings_v3_leading_nan(zigzag_swings: pd.DataFrame) -> None:
+    """Test that v3 still labels swings when the seed window is NaN."""
+    result = classify_swings_v3(zigzag_swings, window=1)
+
+    assert _swing_labels(result) == ZIGZAG_SWING_TYPES
+    assert result["major_high"].isna().all()
+    assert result["major_low"].isna().all()
+    assert (result["market_trend"] == 0).all()
+
+
+@pytest.mark.parametrize("classify", [classify_swings, classify_swings_v2, classify_swings_v3])
+def test_classify_swings_copy_false_mutates_input(
+    zigzag_swings: pd.DataFrame, classify: Callable[..., pd.DataFrame]
+) -> None:
+    """Test that copy=False adds the classification columns to the given frame."""
+    df = zigzag_swings.copy()
+
+    result = classify(df, copy=False)
+
+    assert result is df
+    assert {"swing_type", "major_high", "major_low"} <= set(df.columns)
+    assert "swing_type" not in zigzag_swings.columns
+
+
+@pytest.fixture(scope="module")
+def same_bar_swings() -> pd.DataFrame:
+    """Create pre-computed swings with a high and a low confirmed on bar 3."""
+    return pd.DataFrame(
+        {
+            "high": [100.0, 102.0, 101.0, 110.0, 104.0, 106.0],
+            "low": [95.0, 94.0, 90.0, 85.0, 96.0, 97.0],
+            "close": [98.0, 100.0, 92.0, 100.0, 100.0, 104.0],
+            "swing_high_confirmed": [False, True, False, True, False, True],
+            "swing_low_confirmed": [False, False, True, True, False, False],
+            "swing_high_price": [NAN, 100.0, NAN, 110.0, NAN, 106.0],
+            "swing_low_price": [NAN, NAN, 90.0, 85.0, NAN, NAN],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "classify, major_high, major_low, trend_bias",
+    [
+        (
+            classify_swings,
+            [NAN, 100, 100, 110, 110, 106],
+            [NAN, NAN, 90, 85, 85, 85],
+            None,
+        ),
+        (
+            classify_swings_v2,
+            [NAN, 100, 100, 110, 110, 110],
+            [NAN, 95, 90, 85, 85, 85],
+            [0, 1, -1, -1, 0, -1],
+        ),
+    ],
+)
+def test_classify_swings_same_bar_high_and_low(
+    same_bar_swings: pd.DataFrame,
+    classify: Callable[..., pd.DataFrame],
+    major_high: list[float],
+    major_low: list[float],
+    trend_bias: list[int] | None,
+) -> None:
+    """Test that a bar with both swings handles the high event before the low."""
+    result = classify(same_bar_swings)
+
+    # Both events update their level on bar 3; the low is handled last, so
+    # its LL label replaces the high's HH label on that bar
+    assert _swing_labels(result) == [None, "HH", "LL", "LL", None, "LH"]
+    np.testing.assert_array_equal(result["major_high"], major_high)
+    np.testing.assert_array_equal(result["major_low"], major_low)
+    if trend_bias is not None:
+        assert result["trend_bias"].tolist() == trend_bias
@@ -7,14 +7,26 @@ Tests helper functions for structure analysis.
 from __future__ import annotations
 
 import numpy as np
+import pandas as pd
 import pytest
 
 from src.analysis._structure_utils import (
+    EVENT_HIGH,
+    EVENT_LOW,
+    SWING_TYPES,
+    centered_extremum,
     classify_swing_high,
+    classify_swing_high_batch,
+    classify_swing_high_code,
     classify_swing_low,
+    classify_swing_low_batch,
+    classify_swing_low_code,
     compare_prices,
     detect_duplicates,
+    forward_fill,
+    merge_event_positions,
     merge_sorted_events,
+    previous_values,
     safe_divide,
 )
 
@@ -34,51 +46,93 @@ def test_safe_divide_with_zeros() -> None:
     assert result[2] == 6.0
 
 
-def test_detect_duplicates_no_duplicates() -> None:
-    """Test duplicate detection with no consecutive duplicates."""
-    arr = np.array([True, False, True, False, True])
-    result = detect_duplicates(arr)
+def test_safe_divide_series_fill_value() -> None:
+    """Test that Series keep their index and zero denominators take fill_value."""
+    numerator = pd.Series([10.0, 20.0, 30.0], index=[3, 4, 5])
+    result = safe_divide(numerator, np.array([2, 0, 5]), fill_value=0.0)
 
-    expected = np.array([True, False, True, False, True])
-    np.testing.assert_array_equal(result, expected)
+    pd.testing.assert_series_equal(result, pd.Series([5.0, 0.0, 6.0], index=[3, 4, 5]))
 
 
-def test_detect_duplicates_with_duplicates() -> None:
-    """Test duplicate detection removes consecutive duplicates."""
-    arr = np.array([True, True, False, True, True, True, False])
-    result = detect_duplicates(arr)
+def test_safe_divide_series_denominator() -> None:
+    """Test that a Series denominator alone still yields a Series on its index."""
+    denominator = pd.Series([2.0, 0.0, 5.0], index=[3, 4, 5], name="range")
+    result = safe_divide(np.array([10.0, 20.0, 30.0]), denominator)
 
-    # Should keep only first True in each sequence
-    expected = np.array([True, False, False, True, False, False, False])
-    np.testing.assert_array_equal(result, expected)
+    pd.testing.assert_series_equal(
+        result, pd.Series([5.0, np.nan, 6.0], index=[3, 4, 5], name="range")
+    )
+
+
+_DETECT_DUPLICATES_CASES = {
+    "no_duplicates": (
+        np.array([True, False, True, False, True]),
+        np.array([True, False, True, False, True]),
+    ),
+    # Only the first True of each run is kept
+    "with_duplicates": (
+        np.array([True, True, False, True, True, True, False]),
+        np.array([True, False, False, True, False, False, False]),
+    ),
+    "all_same": (
+        np.array([True, True, True, True]),
+        np.array([True, False, False, False]),
+    ),
+}
+
+
+@pytest.mark.parametrize(
+    "arr, expected", _DETECT_DUPLICATES_CASES.values(), ids=_DETECT_DUPLICATES_CASES.keys()
+)
+def test_detect_duplicates(arr: np.ndarray, expected: np.ndarray) -> None:
+    """Test duplicate detection keeps only the first True in each run."""
+    np.testing.assert_array_equal(detect_duplicates(arr), expected)
+
+
+def test_detect_duplicates_non_bool_input() -> None:
+    """Test that truthy integer input is treated as a boolean mask."""
+    result = detect_duplicates(np.array([1, 1, 0, 2, 2]))
 
+    assert result.dtype == np.bool_
+    np.testing.assert_array_equal(result, np.array([True, False, False, True, False]))
 
-def test_detect_duplicates_all_same() -> None:
-    """Test duplicate detection with all same values."""
-    arr = np.array([True, True, True, True])
-    result = detect_duplicates(arr)
 
-    # Only first element should remain True
-    expected = np.array([True, False, False, False])
+def test_forward_fill() -> None:
+    """Test forward fill propagates last valid value and keeps leading NaNs."""
+    arr = np.array([np.nan, 1.0, np.nan, np.nan, 3.0, np.nan])
+    result = forward_fill(arr)
+
+    expected = np.array([np.nan, 1.0, 1.0, 1.0, 3.0, 3.0])
     np.testing.assert_array_equal(result, expected)
 
 
-def test_compare_prices_higher() -> None:
-    """Test price comparison when current is higher."""
-    result = compare_prices(105.0, 100.0, 0.001)
-    assert result == "HIGHER"
+def test_forward_fill_empty() -> None:
+    """Test forward fill with empty array."""
+    result = forward_fill(np.array([], dtype=np.float64))
+    assert len(result) == 0
 
 
-def test_compare_prices_lower() -> None:
-    """Test price comparison when current is lower."""
-    result = compare_prices(95.0, 100.0, 0.001)
-    assert result == "LOWER"
+def test_centered_extremum_matches_rolling() -> None:
+    """Test centered extremum against pandas centered rolling max/min."""
+    values = np.array([3.0, np.nan, 5.0, 1.0, 4.0, np.nan, np.nan, np.nan, 2.0], dtype=np.float32)
+    series = pd.Series(values, dtype=np.float64)
+    expected_max = series.rolling(3, center=True, min_periods=1).max().to_numpy()
+    expected_min = series.rolling(3, center=True, min_periods=1).min().to_numpy()
+    result_max = centered_extremum(values, 1, "max")
+    result_min = centered_extremum(values, 1, "min")
+    assert result_max.dtype == np.float32
+    np.testing.assert_array_equal(result_max, expected_max)
+    np.testing.assert_array_equal(result_min, expected_min)
 
 
-def test_compare_prices_double_within_tolerance() -> None:
-    """Test price comparison detects double top/bottom."""
-    result = compare_prices(100.05, 100.0, 0.001)
-    assert result == "DOUBLE"
+@pytest.mark.parametrize(
+    "current_price, expected",
+    [(105.0, "HIGHER"), (95.0, "LOWER"), (100.05, "DOUBLE")],
+    ids=["higher", "lower", "double_within_tolerance"],
+)
+def test_compare_prices(current_price: float, expected: str) -> None:
+    """Test price comparison against a last price of 100 with 0.1% tolerance."""
+    assert compare_prices(current_price, 100.0, 0.001) == expected
 
 
 def test_compare_prices_invalid_last_price() -> None:
@@ -93,52 +147,63 @@ def test_compare_prices_invalid_last_price() -> None:
     assert result is None
 
 
-def test_classify_swing_high_hh() -> None:
-    """Test swing high classification: Higher High."""
-    result = classify_swing_high(105.0, 100.0, 0.001)
-    assert result == "HH"
-
-
-def test_classify_swing_high_lh() -> None:
-    """Test swing high classification: Lower High."""
-    result = classify_swing_high(95.0, 100.0, 0.001)
-    assert result == "LH"
+@pytest.mark.parametrize(
+    "price, last_price, expected",
+    [(105.0, 100.0, "HH"), (95.0, 100.0, "LH"), (100.05, 100.0, "DT"), (100.0, -np.inf, "HH")],
+    ids=["hh", "lh", "dt", "first"],
+)
+def test_classify_swing_high(price: float, last_price: float, expected: str) -> None:
+    """Test swing high classification, including the first swing."""
+    assert classify_swing_high(price, last_price, 0.001) == expected
 
 
-def test_classify_swing_high_dt() -> None:
-    """Test swing high classification: Double Top."""
-    result = classify_swing_high(100.05, 100.0, 0.001)
-    assert result == "DT"
+@pytest.mark.parametrize(
+    "price, last_price, expected",
+    [(95.0, 100.0, "LL"), (105.0, 100.0, "HL"), (100.05, 100.0, "DB"), (100.0, np.inf, "LL")],
+    ids=["ll", "hl", "db", "first"],
+)
+def test_classify_swing_low(price: float, last_price: float, expected: str) -> None:
+    """Test swing low classification, including the first swing."""
+    assert classify_swing_low(price, last_price, 0.001) == expected
 
 
-def test_classify_swing_high_first() -> None:
-    """Test swing high classification for first swing."""
-    result = classify_swing_high(100.0, -np.inf, 0.001)
-    assert result == "HH"
+def test_classify_swing_codes_follow_compare_prices() -> None:
+    """Test that swing codes agree with compare_prices, including invalid prices."""
+    high_labels = {None: "HH", "DOUBLE": "DT", "HIGHER": "HH", "LOWER": "LH"}
+    low_labels = {None: "LL", "DOUBLE": "DB", "HIGHER": "HL", "LOWER": "LL"}
 
+    for price in (95.0, 100.0, 100.05, 105.0, np.nan):
+        for last_price in (100.0, 0.0, -np.inf, np.inf):
+            comparison = compare_prices(price, last_price, 0.001)
+            high_code = classify_swing_high_code(price, last_price, 0.001)
+            low_code = classify_swing_low_code(price, last_price, 0.001)
+            assert SWING_TYPES[high_code] == high_labels[comparison]
+            assert SWING_TYPES[low_code] == low_labels[comparison]
 
-def test_classify_swing_low_ll() -> None:
-    """Test swing low classification: Lower Low."""
-    result = classify_swing_low(95.0, 100.0, 0.001)
-    assert result == "LL"
 
+def test_classify_swing_batch_matches_scalar() -> None:
+    """Test that batched swing codes equal the scalar codes element by element."""
+    prices = np.array([95.0, 100.0, 100.05, 105.0, np.nan, 100.0, 100.0])
+    last_prices = np.array([100.0, 100.0, 100.0, 100.0, 100.0, 0.0, -np.inf])
 
-def test_classify_swing_low_hl() -> None:
-    """Test swing low classification: Higher Low."""
-    result = classify_swing_low(105.0, 100.0, 0.001)
-    assert result == "HL"
+    high_codes = classify_swing_high_batch(prices, last_prices, 0.001)
+    low_codes = classify_swing_low_batch(prices, last_prices, 0.001)
 
+    assert high_codes.dtype == np.int8
+    assert high_codes.tolist() == [
+        classify_swing_high_code(p, last, 0.001) for p, last in zip(prices, last_prices)
+    ]
+    assert low_codes.tolist() == [
+        classify_swing_low_code(p, last, 0.001) for p, last in zip(prices, last_prices)
+    ]
 
-def test_classify_swing_low_db() -> None:
-    """Test swing low classification: Double Bottom."""
-    result = classify_swing_low(100.05, 100.0, 0.001)
-    assert result == "DB"
 
+def test_previous_values() -> None:
+    """Test shifting an array right by one with a fill value."""
+    result = previous_values(np.array([1.0, 2.0, 3.0]), -np.inf)
 
-def test_classify_swing_low_first() -> None:
-    """Test swing low classification for first swing."""
-    result = classify_swing_low(100.0, np.inf, 0.001)
-    assert result == "LL"
+    np.testing.assert_array_equal(result, np.array([-np.inf, 1.0, 2.0]))
+    assert len(previous_values(np.array([]), np.inf)) == 0
 
 
 def test_merge_sorted_events_empty() -> None:
@@ -193,3 +258,24 @@ def test_merge_sorted_events_alternating() -> None:
     assert result[3] == (3, "low")
     assert result[4] == (4, "high")
     assert result[5] == (5, "low")
+
+
+def test_merge_event_positions_mixed() -> None:
+    """Test merging position arrays into ordered positions and tags."""
+    positions, tags = merge_event_positions(np.array([1, 5, 7]), np.array([2, 4, 7]))
+
+    np.testing.assert_array_equal(positions, [1, 2, 4, 5, 7, 7])
+    # Ties keep the high event first
+    np.testing.assert_array_equal(
+        tags, [EVENT_HIGH, EVENT_LOW, EVENT_LOW, EVENT_HIGH, EVENT_HIGH, EVENT_LOW]
+    )
+
+
+def test_merge_event_positions_empty() -> None:
+    """Test merging empty position arrays."""
+    positions, tags = merge_event_positions(
+        np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    )
+
+    assert len(positions) == 0
+    assert len(tags) == 0